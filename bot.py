@@ -1,3 +1,4 @@
+import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -5,16 +6,40 @@ import os
 import asyncio
 import time
 import logging
+import logging.handlers
+import queue
 import json
 import sys
+import heapq
+import hashlib
+import functools
+from operator import attrgetter
+from typing import NamedTuple
 from datetime import datetime
-from downloader import download_magnet_with_progress, get_active_downloads_info
+from downloader import download_magnet_with_progress, download_magnets_batch, get_active_downloads_info, shutdown_aria2_daemon
 from encoder import encode_video, get_active_encodes_info, get_encode_count
 from uploader import upload_video_to_drive, get_active_uploads_info, check_gdrive_available
 
 ADMIN_IDS = [000000000000000000, 000000000000000000]
+PROGRESS_EDIT_INTERVAL = 1.5
+# Caps in-flight progress edits across all uploads to stay under Discord's REST budget
+PROGRESS_EDIT_SEMAPHORE = asyncio.Semaphore(4)
+GDRIVE_AVAILABLE = check_gdrive_available()
+MAX_SCAN_ENTRIES = 5000
+_FILE_LINE = "{emoji} **{name}**\n   📊 {size} • 📅 {date}\n\n"
+COMMAND_HASH_FILE = os.path.join("logs", "command_tree.hash")
+VIDEO_EXTS = frozenset({'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm'})
+MP4_EXTS = frozenset({'.mp4'})
+_EXT_EMOJI = {
+    **dict.fromkeys(('.mp4', '.mkv', '.avi', '.mov', '.wmv'), "🎬"),
+    **dict.fromkeys(('.mp3', '.wav', '.flac', '.aac'), "🎵"),
+    **dict.fromkeys(('.zip', '.rar', '.7z'), "📦"),
+}
+
+log_listener = None
 
 def setup_logging():
+    global log_listener
     os.makedirs("logs", exist_ok=True)
     log_filename = os.path.join("logs", f"bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
     
@@ -26,68 +51,206 @@ def setup_logging():
     console_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S')
     console_handler.setFormatter(console_formatter)
     
-    file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+    file_handler = logging.FileHandler(log_filename, encoding='utf-8', delay=True)
     file_handler.setLevel(logging.DEBUG)
     file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
     
+    # Records are handed to a background thread so slow disk/console writes
+    # never run on the event loop.
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    log_listener.start()
+    
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     logging.getLogger('discord').setLevel(logging.WARNING)
     return log_filename
 
-def load_token():
-    try:
-        if os.path.exists("bot_token.txt"):
-            with open("bot_token.txt", "r", encoding='utf-8') as f:
-                return f.read().strip()
-        else:
-            logging.error("bot_token.txt dosyası bulunamadı!")
-            return None
-    except Exception as e:
-        logging.error(f"Token yükleme hatası: {e}")
-        return None
+class EncoderBot(commands.Bot):
+    """Bot whose REST client keeps pooled keep-alive connections to Discord"""
+
+    async def login(self, token: str) -> None:
+        # The connector must be created inside the running loop; every
+        # followup/edit (including frequent progress edits) reuses this pool.
+        self.http.connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=75)
+        await super().login(token)
+
+    async def close(self) -> None:
+        await shutdown_aria2_daemon()
+        await super().close()
 
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = EncoderBot(command_prefix="!", intents=intents)
+WATCHING_ACTIVITY = discord.Activity(
+    type=discord.ActivityType.watching,
+    name="Professional Video Processing"
+)
 tree = bot.tree
 
 log_filename = setup_logging()
 
+try:
+    with open("bot_token.txt", "r", encoding='utf-8') as f:
+        BOT_TOKEN = f.read().strip()
+except FileNotFoundError:
+    BOT_TOKEN = None
+    logging.error("bot_token.txt dosyası bulunamadı!")
+except Exception as e:
+    BOT_TOKEN = None
+    logging.error(f"Token yükleme hatası: {e}")
+
+_BAR_FULL = "█" * 100
+_BAR_EMPTY = "░" * 100
+_PROGRESS_COLORS = ((30, 0xE74C3C), (70, 0xF39C12), (101, 0x27AE60))
+
+_BARS_20 = tuple(f"[{_BAR_FULL[:i]}{_BAR_EMPTY[:20 - i]}] " for i in range(21))
+
 def create_progress_bar(progress: int, length: int = 20) -> str:
     """Create ASCII progress bar"""
+    if length == 20 and 0 <= progress <= 100:
+        return f"{_BARS_20[int(progress) // 5]}{progress}%"
     filled = int(length * progress / 100)
-    empty = length - filled
-    bar = "█" * filled + "░" * empty
-    return f"[{bar}] {progress}%"
+    return f"[{_BAR_FULL[:filled]}{_BAR_EMPTY[:length - filled]}] {progress}%"
+
+def progress_color(progress: int) -> int:
+    """Pick the embed color for a progress percentage"""
+    return next((color for limit, color in _PROGRESS_COLORS if progress < limit), 0x27AE60)
+
+class FileEntry(NamedTuple):
+    name: str
+    ext: str
+    size_bytes: int
+    mtime: float
+    size_mb: float = 0.0
+    date: str = ""
+
+@functools.lru_cache(maxsize=1024)
+def _fmt_date(mtime_minute: int, date_format: str) -> str:
+    """Format a minute-bucketed mtime; cached since many files share a minute"""
+    return time.strftime(date_format, time.localtime(mtime_minute * 60))
+
+def _scan_files(path: str, extensions=None, top_n: int = 10, sort_key: str = 'size_bytes',
+                date_format: str = "%d.%m %H:%M", max_entries: int = MAX_SCAN_ENTRIES) -> dict:
+    """Scan a directory in one pass, keeping only the top_n files by sort_key"""
+    result = {'files': [], 'count': 0, 'total_size': 0, 'truncated': False}
+    if not os.path.exists(path):
+        return result
+
+    def iter_files(entries):
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            name = entry.name
+            dot = name.rfind('.')
+            file_ext = name[dot:].lower() if dot > 0 else ''
+            if extensions is not None and file_ext not in extensions:
+                continue
+            # Only matching files count toward the cap, so truncated means one was left out
+            if result['count'] >= max_entries:
+                result['truncated'] = True
+                return
+
+            st = entry.stat()
+            result['count'] += 1
+            result['total_size'] += st.st_size
+            yield FileEntry(name, file_ext, st.st_size, st.st_mtime)
+
+    with os.scandir(path) as entries:
+        files = heapq.nlargest(top_n, iter_files(entries), key=attrgetter(sort_key))
+
+    result['files'] = [
+        file_info._replace(size_mb=file_info.size_bytes / (1024 * 1024),
+                           date=_fmt_date(int(file_info.mtime) // 60, date_format))
+        for file_info in files
+    ]
+    return result
+
+async def scan_files_async(label: str, *args) -> dict:
+    """Run _scan_files in a worker thread, returning an empty scan on failure"""
+    try:
+        return await asyncio.to_thread(_scan_files, *args)
+    except Exception as e:
+        logging.error(f"{label} directory read error: {e}")
+        return {'files': [], 'count': 0, 'total_size': 0, 'truncated': False}
+
+def _count_text(scan: dict) -> str:
+    return f"{scan['count']}+" if scan['truncated'] else str(scan['count'])
+
+commands_synced = False
+
+def _command_payload(cmd) -> dict:
+    # discord.py 2.4 added the tree argument; 2.3 only accepts to_dict()
+    try:
+        return cmd.to_dict(tree)
+    except TypeError:
+        return cmd.to_dict()
+
+def _command_tree_hash() -> str:
+    payload = json.dumps([_command_payload(cmd) for cmd in tree.get_commands()], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _read_command_hash():
+    try:
+        with open(COMMAND_HASH_FILE, "r", encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _write_command_hash(tree_hash: str):
+    try:
+        with open(COMMAND_HASH_FILE, "w", encoding='utf-8') as f:
+            f.write(tree_hash)
+    except OSError as e:
+        logging.warning(f"⚠️ Komut hash dosyası yazılamadı: {e}")
+
+async def sync_commands_if_changed():
+    """Sync slash commands only when forced or when their definitions changed"""
+    global commands_synced
+    if commands_synced:
+        return
+
+    try:
+        tree_hash = _command_tree_hash()
+    except Exception as e:
+        # Without a hash we cannot tell whether anything changed, so always sync
+        logging.warning(f"⚠️ Komut hash hesaplanamadı, senkronizasyon zorlanıyor: {e}")
+        tree_hash = None
+
+    if tree_hash is not None and os.getenv("BOT_SYNC_COMMANDS") != "1":
+        if tree_hash == await asyncio.to_thread(_read_command_hash):
+            logging.info("✅ Komutlar güncel, senkronizasyon atlandı")
+            commands_synced = True
+            return
+
+    try:
+        synced = await tree.sync()
+        logging.info(f"✅ {len(synced)} komut senkronize edildi")
+        commands_synced = True
+    except Exception as sync_error:
+        logging.error(f"❌ Sync hatası: {sync_error}")
+        return
+
+    if tree_hash is not None:
+        await asyncio.to_thread(_write_command_hash, tree_hash)
 
 @bot.event
 async def on_ready():
     try:
         logging.info(f"🤖 Bot aktif: {bot.user.name}")
-        logging.info(f"📡 {len(bot.guilds)} sunucu, {len(bot.users)} kullanıcı")
-        
-        await bot.change_presence(
-            activity=discord.Activity(
-                type=discord.ActivityType.watching,
-                name="Professional Video Processing"
-            ),
-            status=discord.Status.online
-        )
+        member_count = sum(guild.member_count or 0 for guild in bot.guilds)
+        logging.info(f"📡 {len(bot.guilds)} sunucu, {member_count} kullanıcı")
         
-        try:
-            synced = await tree.sync()
-            logging.info(f"✅ {len(synced)} komut senkronize edildi")
-        except Exception as sync_error:
-            logging.error(f"❌ Sync hatası: {sync_error}")
+        await bot.change_presence(activity=WATCHING_ACTIVITY, status=discord.Status.online)
         
-        from uploader import check_gdrive_available
-        gdrive_available = check_gdrive_available()
-        logging.info(f"📦 Google Drive: {'✅ Aktif' if gdrive_available else '❌ Deaktif'}")
+        await sync_commands_if_changed()
+        
+        logging.info(f"📦 Google Drive: {'✅ Aktif' if GDRIVE_AVAILABLE else '❌ Deaktif'}")
         
     except Exception as e:
         logging.error(f"❌ on_ready hatası: {e}")
@@ -107,8 +270,11 @@ async def slash_upload(interaction: discord.Interaction, video_name: str):
     try:
         user = f"{interaction.user.display_name} ({interaction.user.id})"
         logging.info(f"📤 /upload komutu - {user} - {video_name}")
+        user_mention = interaction.user.mention
+        safe_video_name = discord.utils.escape_markdown(video_name)[:256]
+        video_block = f"```{video_name.replace('`', '')[:256]}```"
 
-        if not check_gdrive_available():
+        if not GDRIVE_AVAILABLE:
             error_embed = discord.Embed(
                 title="❌ Google Drive API Hatası",
                 description="Google Drive API paketleri yüklü değil!",
@@ -123,51 +289,57 @@ async def slash_upload(interaction: discord.Interaction, video_name: str):
             color=0x4285F4,
             timestamp=datetime.now()
         )
-        initial_embed.add_field(name="👤 Kullanıcı", value=interaction.user.mention, inline=True)
+        initial_embed.add_field(name="👤 Kullanıcı", value=user_mention, inline=True)
         initial_embed.add_field(name="📁 Arama Yeri", value="`encode/` klasörü", inline=True)
         initial_embed.set_footer(text="Google Drive Upload System")
 
         await interaction.response.send_message(embed=initial_embed)
 
         progress_message = None
-        last_progress = -1
+        last_emit_ts = 0.0
+        latest_embed = None
+        pending_edit_task = None
 
         async def progress_callback(progress: int, speed: str, eta: str):
-            nonlocal progress_message, last_progress
+            nonlocal last_emit_ts, latest_embed, pending_edit_task
 
-            if progress - last_progress < 5 and progress < 100:
+            now = time.monotonic()
+            if progress not in (0, 100) and now - last_emit_ts < PROGRESS_EDIT_INTERVAL:
                 return
-            last_progress = progress
+            last_emit_ts = now
 
             progress_bar = create_progress_bar(progress)
-            
-            if progress < 30:
-                color = 0xE74C3C
-            elif progress < 70:
-                color = 0xF39C12
-            else:
-                color = 0x27AE60
 
             progress_embed = discord.Embed(
                 title="📤 Google Drive Upload Devam Ediyor",
-                color=color,
+                color=progress_color(progress),
                 timestamp=datetime.now()
             )
-            progress_embed.add_field(name="📁 Video", value=f"```{video_name}```", inline=False)
+            progress_embed.add_field(name="📁 Video", value=video_block, inline=False)
             progress_embed.add_field(name="📊 Progress", value=f"```{progress_bar}```", inline=False)
             progress_embed.add_field(name="🚀 Hız", value=speed, inline=True)
             progress_embed.add_field(name="⏱️ Kalan Süre", value=eta, inline=True)
             progress_embed.add_field(name="🔢 Yüzde", value=f"{progress}%", inline=True)
-            progress_embed.add_field(name="👤 Kullanıcı", value=interaction.user.mention, inline=True)
+            progress_embed.add_field(name="👤 Kullanıcı", value=user_mention, inline=True)
             progress_embed.set_footer(text=f"Google Drive Upload • {progress}% Complete")
 
-            try:
-                if progress_message is None:
-                    progress_message = await interaction.followup.send(embed=progress_embed)
-                else:
-                    await progress_message.edit(embed=progress_embed)
-            except Exception as e:
-                logging.warning(f"Progress update failed: {e}")
+            latest_embed = progress_embed
+            if pending_edit_task is None or pending_edit_task.done():
+                pending_edit_task = asyncio.create_task(flush_progress())
+
+        async def flush_progress():
+            nonlocal progress_message, latest_embed
+
+            while latest_embed is not None:
+                embed, latest_embed = latest_embed, None
+                try:
+                    async with PROGRESS_EDIT_SEMAPHORE:
+                        if progress_message is None:
+                            progress_message = await interaction.followup.send(embed=embed)
+                        else:
+                            await progress_message.edit(embed=embed)
+                except Exception as e:
+                    logging.warning(f"Progress update failed: {e}")
 
         success, result = await upload_video_to_drive(
             video_name=video_name,
@@ -175,6 +347,10 @@ async def slash_upload(interaction: discord.Interaction, video_name: str):
             progress_callback=progress_callback
         )
 
+        if pending_edit_task is not None:
+            latest_embed = None
+            await pending_edit_task
+
         if success:
             success_embed = discord.Embed(
                 title="✅ Google Drive Upload Tamamlandı!",
@@ -207,7 +383,7 @@ async def slash_upload(interaction: discord.Interaction, video_name: str):
                 inline=True
             )
 
-            success_embed.add_field(name="👤 Upload Eden", value=interaction.user.mention, inline=True)
+            success_embed.add_field(name="👤 Upload Eden", value=user_mention, inline=True)
             success_embed.add_field(
                 name="🔗 Erişim Linkleri",
                 value=f"[📖 Görüntüle]({result['view_link']})\n[⬇️ İndir]({result['download_link']})",
@@ -232,8 +408,8 @@ async def slash_upload(interaction: discord.Interaction, video_name: str):
                 color=0xE74C3C,
                 timestamp=datetime.now()
             )
-            error_embed.add_field(name="👤 Kullanıcı", value=interaction.user.mention, inline=True)
-            error_embed.add_field(name="📁 Video", value=video_name, inline=True)
+            error_embed.add_field(name="👤 Kullanıcı", value=user_mention, inline=True)
+            error_embed.add_field(name="📁 Video", value=safe_video_name, inline=True)
             error_embed.set_footer(text="Google Drive Upload System")
 
             try:
@@ -261,38 +437,18 @@ async def slash_uploads(interaction: discord.Interaction):
         user = f"{interaction.user.display_name} ({interaction.user.id})"
         logging.info(f"📤 /uploads komutu - {user}")
 
-        active_uploads_info = get_active_uploads_info()
-        gdrive_status = "✅ Kullanılabilir" if check_gdrive_available() else "❌ API paketi yüklü değil"
+        gdrive_status = "✅ Kullanılabilir" if GDRIVE_AVAILABLE else "❌ API paketi yüklü değil"
 
         encode_dir = "encode"
-        video_files = []
-        total_size = 0
+        max_files_to_show = 10
 
-        if os.path.exists(encode_dir):
-            try:
-                video_extensions = ['.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm']
-                for file in os.listdir(encode_dir):
-                    file_path = os.path.join(encode_dir, file)
-                    if os.path.isfile(file_path):
-                        file_ext = os.path.splitext(file)[1].lower()
-                        if file_ext in video_extensions:
-                            file_size = os.path.getsize(file_path)
-                            file_size_mb = file_size / (1024 * 1024)
-                            file_time = os.path.getmtime(file_path)
-                            file_date = datetime.fromtimestamp(file_time).strftime("%d.%m %H:%M")
-
-                            video_files.append({
-                                'name': file,
-                                'size': file_size_mb,
-                                'date': file_date,
-                                'size_bytes': file_size
-                            })
-                            total_size += file_size
-
-                video_files.sort(key=lambda x: x['size'], reverse=True)
-
-            except Exception as e:
-                logging.error(f"Encode directory read error: {e}")
+        scan, active_uploads_info = await asyncio.gather(
+            scan_files_async("Encode", encode_dir, VIDEO_EXTS, max_files_to_show),
+            asyncio.to_thread(get_active_uploads_info)
+        )
+
+        video_files = scan['files']
+        total_size = scan['total_size']
 
         embed = discord.Embed(
             title="📤 Google Drive Upload Yöneticisi",
@@ -327,28 +483,28 @@ async def slash_uploads(interaction: discord.Interaction):
                 inline=False
             )
         else:
-            files_text = ""
-            max_files_to_show = 10
+            files_parts = []
 
-            for i, file_info in enumerate(video_files[:max_files_to_show]):
-                display_name = file_info['name']
+            for i, file_info in enumerate(video_files):
+                display_name = file_info.name
                 if len(display_name) > 35:
                     name_part = os.path.splitext(display_name)[0][:30]
                     ext_part = os.path.splitext(display_name)[1]
                     display_name = f"{name_part}...{ext_part}"
 
-                size_text = f"{file_info['size']:.1f} MB"
-                if file_info['size'] > 1024:
-                    size_text = f"{file_info['size'] / 1024:.2f} GB"
+                size_text = f"{file_info.size_mb:.1f} MB"
+                if file_info.size_mb > 1024:
+                    size_text = f"{file_info.size_mb / 1024:.2f} GB"
 
-                files_text += f"🎬 **{display_name}**\n"
-                files_text += f"   📊 {size_text} • 📅 {file_info['date']}\n\n"
+                files_parts.append(_FILE_LINE.format(emoji="🎬", name=display_name,
+                                                     size=size_text, date=file_info.date))
 
-            if len(video_files) > max_files_to_show:
-                files_text += f"*...ve {len(video_files) - max_files_to_show} video daha*"
+            if scan['count'] > max_files_to_show:
+                files_parts.append(f"*...ve {scan['count'] - max_files_to_show}{'+' if scan['truncated'] else ''} video daha*")
 
+            files_text = "".join(files_parts)
             embed.add_field(
-                name=f"📁 Upload Edilebilir Videolar ({len(video_files)} dosya)",
+                name=f"📁 Upload Edilebilir Videolar ({_count_text(scan)} dosya)",
                 value=files_text,
                 inline=False
             )
@@ -358,19 +514,19 @@ async def slash_uploads(interaction: discord.Interaction):
 
             embed.add_field(
                 name="📊 Özet Bilgiler",
-                value=f"📁 **Toplam Video:** {len(video_files)}\n💾 **Toplam Boyut:** {size_text}",
+                value=f"📁 **Toplam Video:** {_count_text(scan)}\n💾 **Toplam Boyut:** {size_text}",
                 inline=True
             )
 
             if video_files:
                 biggest_file = video_files[0]
-                biggest_size = f"{biggest_file['size']:.1f} MB"
-                if biggest_file['size'] > 1024:
-                    biggest_size = f"{biggest_file['size'] / 1024:.2f} GB"
+                biggest_size = f"{biggest_file.size_mb:.1f} MB"
+                if biggest_file.size_mb > 1024:
+                    biggest_size = f"{biggest_file.size_mb / 1024:.2f} GB"
 
                 embed.add_field(
                     name="🏆 En Büyük Video",
-                    value=f"🎬 {biggest_file['name'][:25]}{'...' if len(biggest_file['name']) > 25 else ''}\n📊 {biggest_size}",
+                    value=f"🎬 {biggest_file.name[:25]}{'...' if len(biggest_file.name) > 25 else ''}\n📊 {biggest_size}",
                     inline=True
                 )
 
@@ -390,8 +546,8 @@ async def slash_uploads(interaction: discord.Interaction):
 
 @tree.command(name="indir", description="Magnet veya torrent link ile video indir")
 @app_commands.describe(
-    magnet_link="İndirmek istediğiniz magnet link veya torrent link",
-    filename="Kaydedilecek dosya adı (uzantısız)"
+    magnet_link="İndirmek istediğiniz magnet link veya torrent link (birden fazlası için boşlukla ayırın)",
+    filename="Kaydedilecek dosya adı (uzantısız, birden fazla linkte _1, _2... eklenir)"
 )
 async def slash_indir(interaction: discord.Interaction, magnet_link: str, filename: str):
     try:
@@ -409,22 +565,30 @@ async def slash_indir(interaction: discord.Interaction, magnet_link: str, filena
         
         await interaction.response.send_message(embed=initial_embed)
         
-        success, message = await download_magnet_with_progress(
-            magnet_link=magnet_link,
-            custom_name=filename,
-            output_dir="downloads",
-            user_info=user,
-            interaction=interaction
-        )
-        
-        if success:
-            logging.info(f"✅ İndirme başarılı - {user} - {filename}")
+        links = magnet_link.split()
+        if len(links) > 1:
+            # Magnet links never contain spaces, so several can share one command
+            names = [f"{filename}_{i}" for i in range(1, len(links) + 1)]
+            results = await download_magnets_batch(list(zip(links, names)), "downloads", interaction)
         else:
-            logging.error(f"❌ İndirme başarısız - {user} - {filename}: {message}")
+            names = [filename]
+            results = [await download_magnet_with_progress(
+                magnet_link=magnet_link,
+                custom_name=filename,
+                output_dir="downloads",
+                user_info=user,
+                interaction=interaction
+            )]
+        
+        for name, (success, message) in zip(names, results):
+            if success:
+                logging.info(f"✅ İndirme başarılı - {user} - {name}")
+                continue
+            logging.error(f"❌ İndirme başarısız - {user} - {name}: {message}")
             
             error_embed = discord.Embed(
                 title="❌ İndirme Hatası",
-                description=f"**Hata:** {message[:1000]}",
+                description=f"**Dosya:** `{name}`\n**Hata:** {message[:1000]}",
                 color=0xE74C3C,
                 timestamp=datetime.now()
             )
@@ -448,42 +612,11 @@ async def slash_downloads(interaction: discord.Interaction):
         active_downloads_info = get_active_downloads_info()
         
         downloads_dir = "downloads"
-        downloaded_files = []
-        total_size = 0
+        max_files_to_show = 15
+        scan = await scan_files_async("Downloads", downloads_dir, None, max_files_to_show)
         
-        if os.path.exists(downloads_dir):
-            try:
-                for file in os.listdir(downloads_dir):
-                    file_path = os.path.join(downloads_dir, file)
-                    if os.path.isfile(file_path):
-                        file_size = os.path.getsize(file_path)
-                        file_size_mb = file_size / (1024 * 1024)
-                        
-                        file_ext = os.path.splitext(file)[1].lower()
-                        if file_ext in ['.mp4', '.mkv', '.avi', '.mov', '.wmv']:
-                            emoji = "🎬"
-                        elif file_ext in ['.mp3', '.wav', '.flac', '.aac']:
-                            emoji = "🎵"
-                        elif file_ext in ['.zip', '.rar', '.7z']:
-                            emoji = "📦"
-                        else:
-                            emoji = "📄"
-                        
-                        file_time = os.path.getmtime(file_path)
-                        file_date = datetime.fromtimestamp(file_time).strftime("%d.%m %H:%M")
-                        
-                        downloaded_files.append({
-                            'name': file,
-                            'size': file_size_mb,
-                            'date': file_date,
-                            'emoji': emoji
-                        })
-                        total_size += file_size
-                
-                downloaded_files.sort(key=lambda x: x['size'], reverse=True)
-                
-            except Exception as e:
-                logging.error(f"Downloads directory read error: {e}")
+        downloaded_files = scan['files']
+        total_size = scan['total_size']
         
         embed = discord.Embed(
             title="📥 İndirme Yöneticisi",
@@ -512,24 +645,24 @@ async def slash_downloads(interaction: discord.Interaction):
                 inline=False
             )
         else:
-            files_text = ""
-            max_files_to_show = 15
+            files_parts = []
             
-            for i, file_info in enumerate(downloaded_files[:max_files_to_show]):
-                display_name = file_info['name']
+            for i, file_info in enumerate(downloaded_files):
+                display_name = file_info.name
                 if len(display_name) > 35:
                     name_part = os.path.splitext(display_name)[0][:30]
                     ext_part = os.path.splitext(display_name)[1]
                     display_name = f"{name_part}...{ext_part}"
                 
-                files_text += f"{file_info['emoji']} **{display_name}**\n"
-                files_text += f"   📊 {file_info['size']:.1f} MB • 📅 {file_info['date']}\n\n"
+                files_parts.append(_FILE_LINE.format(emoji=_EXT_EMOJI.get(file_info.ext, "📄"), name=display_name,
+                                                     size=f"{file_info.size_mb:.1f} MB", date=file_info.date))
             
-            if len(downloaded_files) > max_files_to_show:
-                files_text += f"*...ve {len(downloaded_files) - max_files_to_show} dosya daha*"
+            if scan['count'] > max_files_to_show:
+                files_parts.append(f"*...ve {scan['count'] - max_files_to_show}{'+' if scan['truncated'] else ''} dosya daha*")
             
+            files_text = "".join(files_parts)
             embed.add_field(
-                name=f"📁 Downloads Klasörü ({len(downloaded_files)} dosya)",
+                name=f"📁 Downloads Klasörü ({_count_text(scan)} dosya)",
                 value=files_text,
                 inline=False
             )
@@ -539,7 +672,7 @@ async def slash_downloads(interaction: discord.Interaction):
             
             embed.add_field(
                 name="📊 Özet Bilgiler",
-                value=f"📁 **Toplam Dosya:** {len(downloaded_files)}\n💾 **Toplam Boyut:** {size_text}",
+                value=f"📁 **Toplam Dosya:** {_count_text(scan)}\n💾 **Toplam Boyut:** {size_text}",
                 inline=True
             )
             
@@ -547,7 +680,7 @@ async def slash_downloads(interaction: discord.Interaction):
                 biggest_file = downloaded_files[0]
                 embed.add_field(
                     name="🏆 En Büyük Dosya",
-                    value=f"{biggest_file['emoji']} {biggest_file['name'][:25]}{'...' if len(biggest_file['name']) > 25 else ''}\n📊 {biggest_file['size']:.1f} MB",
+                    value=f"{_EXT_EMOJI.get(biggest_file.ext, '📄')} {biggest_file.name[:25]}{'...' if len(biggest_file.name) > 25 else ''}\n📊 {biggest_file.size_mb:.1f} MB",
                     inline=True
                 )
         
@@ -669,34 +802,16 @@ async def encode_stats_command(interaction: discord.Interaction):
         user = f"{interaction.user.display_name} ({interaction.user.id})"
         logging.info(f"📈 /encodestats komutu - {user}")
         
-        active_encodes = get_active_encodes_info()
-        active_count = get_encode_count()
-        
         encode_dir = "encode"
-        encoded_files = []
-        total_encoded_size = 0
         
-        if os.path.exists(encode_dir):
-            try:
-                for file in os.listdir(encode_dir):
-                    if file.endswith('.mp4'):
-                        file_path = os.path.join(encode_dir, file)
-                        if os.path.isfile(file_path):
-                            file_size = os.path.getsize(file_path)
-                            file_time = os.path.getmtime(file_path)
-                            file_date = datetime.fromtimestamp(file_time).strftime("%d.%m.%Y %H:%M")
-                            
-                            encoded_files.append({
-                                'name': file,
-                                'size': file_size / (1024 * 1024),
-                                'date': file_date
-                            })
-                            total_encoded_size += file_size
-                
-                encoded_files.sort(key=lambda x: os.path.getmtime(os.path.join(encode_dir, x['name'])), reverse=True)
-                
-            except Exception as e:
-                logging.error(f"Encode directory read error: {e}")
+        scan, active_encodes, active_count = await asyncio.gather(
+            scan_files_async("Encode", encode_dir, MP4_EXTS, 5, 'mtime', "%d.%m.%Y %H:%M"),
+            asyncio.to_thread(get_active_encodes_info),
+            asyncio.to_thread(get_encode_count)
+        )
+        
+        encoded_files = scan['files']
+        total_encoded_size = scan['total_size']
         
         embed = discord.Embed(
             title="📈 Encode İstatistikleri",
@@ -728,24 +843,25 @@ async def encode_stats_command(interaction: discord.Interaction):
             
             embed.add_field(
                 name="📊 Encode Edilen Dosyalar",
-                value=f"**Toplam:** {len(encoded_files)} dosya\n"
+                value=f"**Toplam:** {_count_text(scan)} dosya\n"
                       f"**Boyut:** {total_gb:.2f} GB\n"
                       f"**Klasör:** `encode/`",
                 inline=True
             )
             
-            recent_files_text = ""
-            for i, file_info in enumerate(encoded_files[:5]):
-                display_name = file_info['name']
+            recent_files_parts = []
+            for i, file_info in enumerate(encoded_files):
+                display_name = file_info.name
                 if len(display_name) > 30:
                     display_name = display_name[:27] + "..."
                 
-                recent_files_text += f"🎬 **{display_name}**\n"
-                recent_files_text += f"   📊 {file_info['size']:.1f} MB • 📅 {file_info['date']}\n\n"
+                recent_files_parts.append(_FILE_LINE.format(emoji="🎬", name=display_name,
+                                                            size=f"{file_info.size_mb:.1f} MB", date=file_info.date))
             
-            if len(encoded_files) > 5:
-                recent_files_text += f"*...ve {len(encoded_files) - 5} dosya daha*"
+            if scan['count'] > 5:
+                recent_files_parts.append(f"*...ve {scan['count'] - 5}{'+' if scan['truncated'] else ''} dosya daha*")
             
+            recent_files_text = "".join(recent_files_parts)
             embed.add_field(
                 name="🕒 Son Encode'lanan Dosyalar",
                 value=recent_files_text if recent_files_text else "Henüz encode edilmiş dosya yok.",
@@ -773,13 +889,14 @@ async def encode_stats_command(interaction: discord.Interaction):
 def main():
     try:
         if sys.platform == "win32":
-            os.system("chcp 65001")
+            import ctypes
+            ctypes.windll.kernel32.SetConsoleOutputCP(65001)
             if hasattr(sys.stdout, 'reconfigure'):
                 sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
             if hasattr(sys.stderr, 'reconfigure'):
                 sys.stderr.reconfigure(encoding='utf-8', errors='ignore')
         
-        token = load_token()
+        token = BOT_TOKEN
         if not token:
             print("❌ Bot token bulunamadı! Lütfen bot_token.txt dosyasını oluşturun.")
             return
@@ -800,6 +917,9 @@ def main():
     except Exception as e:
         logging.error(f"🚨 Bot başlatma hatası: {e}")
         print(f"❌ Bot başlatma hatası: {e}")
+    finally:
+        if log_listener:
+            log_listener.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,103 +1,410 @@
 import asyncio
-import subprocess
 import os
+import sys
 import time
 import re
 import json
 import logging
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List, Tuple
+import aiohttp
 import discord
-import uuid
+import secrets
+import socket
 from datetime import datetime
 
 class SimpleDownloadManager:
     def __init__(self):
         self.active_downloads = {}
-        self.lock = asyncio.Lock()
     
-    async def add_download(self, download_id: str, info: dict):
-        async with self.lock:
-            self.active_downloads[download_id] = info
+    def add_download(self, download_id: str, info: dict):
+        self.active_downloads[download_id] = info
     
-    async def remove_download(self, download_id: str):
-        async with self.lock:
-            self.active_downloads.pop(download_id, None)
+    def remove_download(self, download_id: str):
+        self.active_downloads.pop(download_id, None)
     
-    async def get_download(self, download_id: str):
-        async with self.lock:
-            return self.active_downloads.get(download_id)
+    def get_download(self, download_id: str):
+        return self.active_downloads.get(download_id)
 
 download_manager = SimpleDownloadManager()
 
-def get_aria2_path():
+ARIA2_RPC_PORT = int(os.environ.get("ARIA2_RPC_PORT", "6800"))
+VIDEO_EXTENSIONS = frozenset({'.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.ts', '.m2ts'})
+ARIA2_ACTIVE_STATES = ("active", "waiting", "paused")
+ARIA2_DONE_NOTIFICATIONS = ("aria2.onDownloadComplete", "aria2.onBtDownloadComplete",
+                            "aria2.onDownloadError", "aria2.onDownloadStop")
+ARIA2_STATUS_KEYS = ["status", "totalLength", "completedLength", "downloadSpeed", "followedBy", "errorMessage", "files"]
+MAX_CONCURRENT_DOWNLOADS = int(os.environ.get("MAX_CONCURRENT_DOWNLOADS", "3"))
+DOWNLOAD_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+_ARIA2_PATH: Optional[str] = None
+
+async def _probe_aria2(path: str) -> Optional[str]:
+    try:
+        process = await asyncio.create_subprocess_exec(
+            path, "--version",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except Exception as e:
+        logging.debug(f"Aria2c test hatası {path}: {e}")
+        return None
+    try:
+        return_code = await asyncio.wait_for(process.wait(), timeout=5)
+    except asyncio.TimeoutError:
+        process.kill()
+        logging.debug(f"Aria2c test zaman aşımı: {path}")
+        return None
+    return path if return_code == 0 else None
+
+def _pick_rpc_port(preferred: int) -> int:
+    """Use the preferred RPC port if it is free, otherwise any free local port"""
+    for port in (preferred, 0):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(("127.0.0.1", port))
+            except OSError:
+                continue
+            return sock.getsockname()[1]
+    raise RuntimeError("❌ Aria2c RPC için boş port bulunamadı!")
+
+async def get_aria2_path():
+    global _ARIA2_PATH
+    if _ARIA2_PATH:
+        return _ARIA2_PATH
+
     paths = ["aria2c", "aria2c.exe", r"C:\aria2\aria2c.exe", r"C:\Program Files\aria2\aria2c.exe"]
-    for path in paths:
-        try:
-            result = subprocess.run([path, "--version"], 
-                                  capture_output=True, timeout=5)
-            if result.returncode == 0:
-                logging.info(f"✅ Aria2c bulundu: {path}")
-                return path
-        except Exception as e:
-            logging.debug(f"Aria2c test hatası {path}: {e}")
-            continue
+    results = await asyncio.gather(*(_probe_aria2(path) for path in paths))
+    for path in results:
+        if path:
+            logging.info(f"✅ Aria2c bulundu: {path}")
+            _ARIA2_PATH = path
+            return path
     
     logging.error("❌ Aria2c hiçbir yerde bulunamadı!")
     raise FileNotFoundError("❌ Aria2c bulunamadı! Lütfen aria2c'yi yükleyin ve PATH'e ekleyin.")
 
+class Aria2Daemon:
+    """Long-lived aria2c process controlled over its JSON-RPC interface"""
+
+    def __init__(self, port: int = ARIA2_RPC_PORT):
+        self.preferred_port = port
+        self.port = None
+        self.rpc_url = None
+        self.ws_url = None
+        self.secret = secrets.token_hex(16)
+        self.process = None
+        self.session = None
+        self.listener_task = None
+        self.events: Dict[str, asyncio.Event] = {}
+        self.start_lock = asyncio.Lock()
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        async with self.start_lock:
+            if self.is_running():
+                return
+
+            aria2_path = await get_aria2_path()
+            # Another aria2c may already own the default port; never talk to a foreign daemon
+            self.port = _pick_rpc_port(self.preferred_port)
+            if self.port != self.preferred_port:
+                logging.warning(f"⚠️ Aria2c RPC portu {self.preferred_port} dolu, {self.port} kullanılıyor")
+            self.rpc_url = f"http://127.0.0.1:{self.port}/jsonrpc"
+            self.ws_url = f"ws://127.0.0.1:{self.port}/jsonrpc"
+            command = [
+                aria2_path,
+                "--enable-rpc",
+                "--rpc-listen-all=false",
+                f"--rpc-listen-port={self.port}",
+                f"--rpc-secret={self.secret}",
+                "--seed-time=0",
+                "--max-connection-per-server=16",
+                "--split=8",
+                "--min-split-size=1M",
+                "--continue=true",
+                # fallocate(2) reserves the file instantly; Windows builds lack it
+                "--file-allocation=prealloc" if sys.platform == "win32" else "--file-allocation=falloc",
+                "--disk-cache=64M",
+                "--piece-length=1M",
+                "--bt-max-open-files=200",
+                "--check-certificate=false",
+                "--timeout=60",
+                "--retry-wait=2",
+                "--max-tries=5",
+                "--bt-max-peers=50",
+                "--bt-request-peer-speed-limit=50M",
+                "--max-overall-download-limit=0",
+                "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            ]
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                # aria2c writes its own log file; its console output is never piped back
+                os.makedirs("logs", exist_ok=True)
+                command += [f"--log={os.path.join('logs', 'aria2c.log')}", "--log-level=info"]
+
+            if self.session is None or self.session.closed:
+                self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+
+            self.process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            logging.info(f"🚀 Aria2c RPC daemon başlatıldı (PID: {self.process.pid}, port: {self.port})")
+
+            for _ in range(50):
+                if self.process.returncode is not None:
+                    break
+                try:
+                    await self.call("aria2.getVersion")
+                    self.listener_task = asyncio.create_task(self._listen())
+                    return
+                except Exception:
+                    await asyncio.sleep(0.1)
+
+            await self.stop()
+            raise RuntimeError("❌ Aria2c RPC daemon başlatılamadı!")
+
+    async def call(self, method: str, *params):
+        payload = {
+            "jsonrpc": "2.0",
+            "id": secrets.token_hex(4),
+            "method": method,
+            "params": [f"token:{self.secret}", *params]
+        }
+        async with self.session.post(self.rpc_url, json=payload) as response:
+            data = await response.json(content_type=None)
+        if "error" in data:
+            raise RuntimeError(f"Aria2 RPC hatası ({method}): {data['error'].get('message')}")
+        return data["result"]
+
+    def watch(self, gid: str) -> asyncio.Event:
+        return self.events.setdefault(gid, asyncio.Event())
+
+    def unwatch(self, gid: str):
+        self.events.pop(gid, None)
+
+    async def release(self, gid: str):
+        """Drop a stopped download from aria2's result list so it does not grow forever"""
+        try:
+            await self.call("aria2.removeDownloadResult", gid)
+        except Exception as e:
+            logging.debug(f"Aria2c removeDownloadResult error [{gid}]: {e}")
+
+    def notify(self, gid: str):
+        event = self.events.get(gid)
+        if event:
+            event.set()
+
+    async def _listen(self):
+        """Wake waiting downloads from aria2's WebSocket notifications"""
+        try:
+            async with self.session.ws_connect(self.ws_url) as ws:
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    data = json.loads(msg.data)
+                    if data.get("method") in ARIA2_DONE_NOTIFICATIONS:
+                        for event_info in data.get("params", []):
+                            self.notify(event_info.get("gid"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"⚠️ Aria2c bildirim bağlantısı kapandı: {e}")
+
+    async def stop(self):
+        if self.listener_task is not None:
+            self.listener_task.cancel()
+            self.listener_task = None
+        if self.is_running():
+            try:
+                self.process.terminate()
+                await asyncio.wait_for(self.process.wait(), timeout=10)
+            except Exception:
+                self.process.kill()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.process = None
+        self.session = None
+
+aria2_daemon = Aria2Daemon()
+
+async def get_or_start_aria2_daemon() -> Aria2Daemon:
+    if not aria2_daemon.is_running():
+        await aria2_daemon.start()
+    return aria2_daemon
+
+async def shutdown_aria2_daemon():
+    await aria2_daemon.stop()
+
+class EmbedUpdateScheduler:
+    """Coalesces progress embed edits and flushes them from one background task"""
+
+    def __init__(self, flush_interval: float = 2.0, min_edit_interval: float = 4.0):
+        self.flush_interval = flush_interval
+        self.min_edit_interval = min_edit_interval
+        self.pending: Dict[int, tuple] = {}
+        self.last_edit: Dict[int, float] = {}
+        self.in_flight: Dict[int, asyncio.Task] = {}
+        self.flush_task = None
+
+    def schedule(self, message: discord.Message, embed: discord.Embed):
+        # Last write wins: an unflushed older embed for the same message is replaced
+        self.pending[message.id] = (message, embed)
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def discard(self, message: discord.Message):
+        """Drop a queued edit and wait out a running one, e.g. before writing a final status embed"""
+        self.pending.pop(message.id, None)
+        self.last_edit.pop(message.id, None)
+        task = self.in_flight.get(message.id)
+        if task is not None:
+            await asyncio.wait([task])
+
+    async def _flush_loop(self):
+        while self.pending:
+            await asyncio.sleep(self.flush_interval)
+            now = time.monotonic()
+            due = [
+                (message_id, message, embed)
+                for message_id, (message, embed) in self.pending.items()
+                if now - self.last_edit.get(message_id, 0.0) >= self.min_edit_interval
+            ]
+            tasks = []
+            for message_id, message, embed in due:
+                del self.pending[message_id]
+                self.last_edit[message_id] = now
+                task = asyncio.create_task(self._edit(message, embed))
+                self.in_flight[message_id] = task
+                tasks.append(task)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _edit(self, message: discord.Message, embed: discord.Embed):
+        try:
+            await message.edit(embed=embed)
+        except Exception as e:
+            # Deleted or unreachable messages should not keep a last_edit entry around
+            self.last_edit.pop(message.id, None)
+            logging.debug("Embed edit error [%s]: %s", message.id, e)
+        finally:
+            if self.in_flight.get(message.id) is asyncio.current_task():
+                del self.in_flight[message.id]
+
+embed_scheduler = EmbedUpdateScheduler()
+
+progress_ticker_task = None
+
+def ensure_progress_ticker():
+    global progress_ticker_task
+    if progress_ticker_task is None or progress_ticker_task.done():
+        progress_ticker_task = asyncio.create_task(_progress_ticker())
+
+async def _progress_ticker():
+    """One shared timer refreshing every active download's embed"""
+    while True:
+        await asyncio.sleep(5)
+        downloads = list(download_manager.active_downloads.items())
+        if not downloads:
+            return
+        now = time.monotonic()
+        await asyncio.gather(*(_refresh_download(dl_id, info, now) for dl_id, info in downloads))
+
+async def _refresh_download(download_id: str, info: dict, now: float):
+    try:
+        status = await aria2_daemon.call("aria2.tellStatus", info['gid'], ARIA2_STATUS_KEYS)
+    except Exception as e:
+        logging.debug("Status poll error [%s]: %s", download_id, e)
+        return
+
+    if status.get("status") not in ARIA2_ACTIVE_STATES:
+        # Safety net in case the WebSocket notification was missed
+        aria2_daemon.notify(info['gid'])
+        return
+
+    progress_msg = info.get('progress_msg')
+    if not progress_msg:
+        return
+
+    try:
+        elapsed_min = int((now - info['start_monotonic']) / 60)
+        total_length = int(status.get("totalLength", 0))
+        completed_length = int(status.get("completedLength", 0))
+        percent = completed_length * 100 // total_length if total_length else 0
+        speed_mb = int(status.get("downloadSpeed", 0)) / (1024 * 1024)
+        
+        embed = info['progress_embed']
+        embed.description = f"**ID:** `{download_id}`\n**Dosya:** `{info['name']}`\n📊 İlerleme: {percent}% • 🚀 {speed_mb:.1f} MB/s\n⏱️ Geçen süre: {elapsed_min} dakika"
+        embed.timestamp = datetime.now()
+        
+        embed_scheduler.schedule(progress_msg, embed)
+        logging.debug("📊 Progress scheduled [%s] - %d min", download_id, elapsed_min)
+    except Exception as update_error:
+        logging.debug("Progress update error [%s]: %s", download_id, update_error)
+
+async def _wait_until_done(daemon: Aria2Daemon, download_id: str, download_info: dict):
+    """Wait for aria2 to finish the download, following magnet metadata GIDs"""
+    while True:
+        gid = download_info['gid']
+        # Register before checking so a notification arriving in between is not lost
+        done_event = daemon.watch(gid)
+        status = await daemon.call("aria2.tellStatus", gid, ARIA2_STATUS_KEYS)
+        if status.get("status") in ARIA2_ACTIVE_STATES:
+            await done_event.wait()
+            status = await daemon.call("aria2.tellStatus", gid, ARIA2_STATUS_KEYS)
+        daemon.unwatch(gid)
+        state = status.get("status")
+        
+        if state == "complete":
+            followed_by = status.get("followedBy")
+            if followed_by:
+                # Magnet metadata finished; aria2 continues with the actual torrent
+                download_info['gid'] = followed_by[0]
+                await daemon.release(gid)
+                continue
+            return True, status
+        if state in ("error", "removed"):
+            logging.error(f"❌ Aria2c hatası [{download_id}]: {status.get('errorMessage', state)}")
+            return False, status
+
 async def download_magnet_fast(magnet_link: str, custom_name: str, 
                               output_dir: str = "downloads", 
                               interaction: Optional[discord.Interaction] = None):
-    
-    download_id = str(uuid.uuid4())[:8].upper()
+    if DOWNLOAD_SEMAPHORE.locked():
+        logging.info(f"⏳ İndirme sırada bekliyor: {custom_name} (limit: {MAX_CONCURRENT_DOWNLOADS})")
+    async with DOWNLOAD_SEMAPHORE:
+        return await _download_magnet(magnet_link, custom_name, output_dir, interaction)
+
+async def _download_magnet(magnet_link: str, custom_name: str, output_dir: str,
+                           interaction: Optional[discord.Interaction]):
+    download_id = secrets.token_hex(4).upper()
     start_time = time.time()
+    start_monotonic = time.monotonic()
     
     os.makedirs(output_dir, exist_ok=True)
     
     try:
-        aria2_path = get_aria2_path()
-    except FileNotFoundError as e:
+        daemon = await get_or_start_aria2_daemon()
+    except (FileNotFoundError, RuntimeError) as e:
         return False, str(e)
     
-
-    command = [
-        aria2_path,
-        "--seed-time=0",
-        "--dir=" + output_dir,
-        "--max-connection-per-server=16",
-        "--split=8", 
-        "--min-split-size=1M",
-        "--continue=true",
-        "--file-allocation=prealloc",
-        "--summary-interval=2",
-        "--console-log-level=info",
-        "--check-certificate=false",
-        "--timeout=60",
-        "--retry-wait=2",
-        "--max-tries=5",
-        "--bt-max-peers=50",
-        "--bt-request-peer-speed-limit=50M",
-        "--max-overall-download-limit=0",
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        magnet_link
-    ]
-    
     logging.info(f"🚀 Download başlatılıyor [{download_id}]: {custom_name}")
-    logging.debug(f"📝 Aria2c command: {' '.join(command[:10])}...")
     
+    gid = None
     try:
-        process = await asyncio.create_subprocess_exec(
-            *command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        gid = await daemon.call("aria2.addUri", [magnet_link], {"dir": os.path.abspath(output_dir)})
+        logging.debug(f"📝 Aria2c GID [{download_id}]: {gid}")
         
-        await download_manager.add_download(download_id, {
-            'process': process,
+        download_info = {
+            'gid': gid,
             'start_time': start_time,
+            'start_monotonic': start_monotonic,
             'status': 'downloading',
-            'name': custom_name
-        })
+            'name': custom_name,
+            'progress_msg': None
+        }
+        download_manager.add_download(download_id, download_info)
         
         progress_msg = None
 
@@ -111,99 +418,67 @@ async def download_magnet_fast(magnet_link: str, custom_name: str,
                 )
                 embed.set_footer(text=f"Download ID: {download_id}")
                 progress_msg = await interaction.followup.send(embed=embed)
+                download_info['progress_msg'] = progress_msg
+                
+                progress_embed = discord.Embed(title="⬇️ İndirme Devam Ediyor", color=0xF39C12)
+                progress_embed.set_footer(text=f"Download ID: {download_id} | Aria2c Engine")
+                download_info['progress_embed'] = progress_embed
                 logging.info(f"📱 Discord progress mesajı gönderildi [{download_id}]")
             except Exception as discord_error:
                 logging.error(f"❌ Discord mesaj hatası [{download_id}]: {discord_error}")
         
-        last_update = 0
-        last_percent = 0
-        max_idle_time = 300  
-        max_total_time = 1800  
+        ensure_progress_ticker()
         
-
-        async def read_output():
-            output_lines = []
-            try:
-                while True:
-                    line = await process.stdout.readline()
-                    if not line:
-                        break
-                    line_str = line.decode('utf-8', errors='ignore').strip()
-                    if line_str:
-                        output_lines.append(line_str)
-                        logging.debug(f"📝 Aria2c [{download_id}]: {line_str[:100]}")
-            except Exception as e:
-                logging.debug(f"Output reading error [{download_id}]: {e}")
-            return output_lines
+        max_total_time = 1800  
+        finished = False
+        status = {}
         
-        output_task = asyncio.create_task(read_output())
+        try:
+            # One deadline for the whole download instead of a fresh timer per wait
+            finished, status = await asyncio.wait_for(
+                _wait_until_done(daemon, download_id, download_info), timeout=max_total_time
+            )
+        except asyncio.TimeoutError:
+            logging.warning(f"⏰ Total timeout [{download_id}] after {max_total_time/60:.1f} minutes")
+        except Exception as e:
+            logging.error(f"❌ Monitoring error [{download_id}]: {e}")
         
-        while process.returncode is None:
-            try:
-                current_time = time.time()
-                
-                if current_time - start_time > max_total_time:
-                    logging.warning(f"⏰ Total timeout [{download_id}] after {max_total_time/60:.1f} minutes")
-                    break
-                
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=2.0)
-                    break  
-                except asyncio.TimeoutError:
-                    pass  
-                
-                if current_time - last_update > 5: 
-                    last_update = current_time
-                    
-                    if progress_msg:
-                        try:
-                            elapsed_min = int((current_time - start_time) / 60)
-                            
-                            embed = discord.Embed(
-                                title="⬇️ İndirme Devam Ediyor",
-                                description=f"**ID:** `{download_id}`\n**Dosya:** `{custom_name}`\n⏱️ Geçen süre: {elapsed_min} dakika",
-                                color=0xF39C12,
-                                timestamp=datetime.now()
-                            )
-                            embed.set_footer(text=f"Download ID: {download_id} | Aria2c Engine")
-                            
-                            await progress_msg.edit(embed=embed)
-                            logging.debug(f"📊 Progress updated [{download_id}] - {elapsed_min} min")
-                        except Exception as update_error:
-                            logging.debug(f"Progress update error [{download_id}]: {update_error}")
-                
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                logging.error(f"❌ Monitoring error [{download_id}]: {e}")
-                break
+        gid = download_info['gid']
+        daemon.unwatch(gid)
         
-        if process.returncode is None:
-            logging.info(f"⏹️ Terminating process [{download_id}]")
+        if not finished and status.get("status") not in ("error", "removed"):
+            logging.info(f"⏹️ Removing download [{download_id}]")
+            stopped_event = daemon.watch(gid)
             try:
-                process.terminate()
-                await asyncio.wait_for(process.wait(), timeout=10)
-            except:
-                logging.warning(f"⚠️ Force killing process [{download_id}]")
-                process.kill()
-        
-        if not output_task.done():
-            output_task.cancel()
+                await daemon.call("aria2.remove", gid)
+                # The result can only be removed once aria2 has actually stopped the download
+                await asyncio.wait_for(stopped_event.wait(), timeout=10)
+            except Exception as remove_error:
+                logging.debug(f"Aria2c remove error [{download_id}]: {remove_error}")
+            daemon.unwatch(gid)
+        await daemon.release(gid)
         
-        await download_manager.remove_download(download_id)
+        download_manager.remove_download(download_id)
         
-        return_code = process.returncode
-        logging.info(f"📋 Process finished [{download_id}] - Return code: {return_code}")
+        logging.info(f"📋 Download finished [{download_id}] - Status: {status.get('status', 'unknown')}")
         
-        result_file = find_downloaded_file(output_dir, custom_name)
+        result_file = None
+        if finished:
+            completed_file = completed_file_from_status(status)
+            if completed_file:
+                result_file = rename_to_custom_name(completed_file, output_dir, custom_name)
+            else:
+                logging.warning(f"⚠️ Aria2c dosya yolu bildirmedi, klasör taranıyor [{download_id}]")
+                result_file = find_downloaded_file(output_dir, custom_name)
         
         if result_file:
             file_size = os.path.getsize(result_file) / (1024 * 1024)
-            download_time = int((time.time() - start_time) / 60)
+            download_time = int((time.monotonic() - start_monotonic) / 60)
             
             logging.info(f"✅ Download SUCCESS [{download_id}] - {os.path.basename(result_file)} ({file_size:.1f} MB) in {download_time} min")
             
             if progress_msg:
+                await embed_scheduler.discard(progress_msg)
                 try:
                     embed = discord.Embed(
                         title="✅ İndirme Tamamlandı!",
@@ -218,10 +493,11 @@ async def download_magnet_fast(magnet_link: str, custom_name: str,
             
             return True, os.path.basename(result_file)
         else:
-            error_msg = f"İndirilen dosya bulunamadı (return code: {return_code})"
+            error_msg = f"İndirilen dosya bulunamadı (durum: {status.get('status', 'unknown')})"
             logging.error(f"❌ {error_msg} [{download_id}]")
             
             if progress_msg:
+                await embed_scheduler.discard(progress_msg)
                 try:
                     embed = discord.Embed(
                         title="❌ İndirme Hatası",
@@ -238,13 +514,11 @@ async def download_magnet_fast(magnet_link: str, custom_name: str,
     except Exception as e:
         error_msg = f"İndirme kritik hatası: {str(e)}"
         logging.error(f"❌ {error_msg} [{download_id}]")
-        await download_manager.remove_download(download_id)
+        download_manager.remove_download(download_id)
         return False, error_msg
 
 def find_downloaded_file(output_dir: str, custom_name: str) -> Optional[str]:
     try:
-        video_extensions = ['.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.ts', '.m2ts']
-        
         current_time = time.time()
         
         if not os.path.exists(output_dir):
@@ -253,61 +527,41 @@ def find_downloaded_file(output_dir: str, custom_name: str) -> Optional[str]:
         
         logging.info(f"🔍 Searching for downloaded files in: {output_dir}")
         
-        all_files = os.listdir(output_dir)
-        logging.info(f"📂 Directory contents ({len(all_files)} files):")
-        for i, file in enumerate(all_files, 1):
-            file_path = os.path.join(output_dir, file)
-            if os.path.isfile(file_path):
-                size_mb = os.path.getsize(file_path) / (1024*1024)
-                mtime = os.path.getmtime(file_path)
-                age_minutes = (current_time - mtime) / 60
-                logging.info(f"   {i}. {file} | {size_mb:.1f} MB | {age_minutes:.1f} min ago")
-            else:
-                logging.info(f"   {i}. {file} | [DIRECTORY]")
+        all_files = []
+        regular_files = []
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                all_files.append(entry.name)
+                if entry.is_file():
+                    st = entry.stat()
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    regular_files.append((entry.name, entry.path, ext, st.st_size, st.st_mtime))
+        
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            listing = "\n".join(
+                f"   {i}. {file} | {file_size / (1024*1024):.1f} MB | {(current_time - file_mtime) / 60:.1f} min ago"
+                for i, (file, _, _, file_size, file_mtime) in enumerate(regular_files, 1)
+            )
+            logging.debug("📂 Directory contents (%d files):\n%s", len(all_files), listing)
         
         recent_files = []
         candidate_files = []
         
-        for file in all_files:
-            file_path = os.path.join(output_dir, file)
-            
-            if not os.path.isfile(file_path):
-                continue
-            
-            file_size = os.path.getsize(file_path)
-            file_mtime = os.path.getmtime(file_path)
+        for file, file_path, ext, file_size, file_mtime in regular_files:
             age_hours = (current_time - file_mtime) / 3600
-            
-            logging.info(f"🔍 Checking: {file}")
-            logging.info(f"   - Size: {file_size / (1024*1024):.1f} MB")
-            logging.info(f"   - Age: {age_hours:.1f} hours")
-            logging.info(f"   - Extension: {os.path.splitext(file)[1].lower()}")
-            
-
-            is_video = any(file.lower().endswith(ext) for ext in video_extensions)
-            logging.info(f"   - Is video: {is_video}")
+            is_video = ext in VIDEO_EXTENSIONS
             
             if is_video:
-                candidate_files.append(file_path)
-                logging.info(f"   ✅ Added as video candidate")
-                
+                candidate_files.append((file_size, file_path))
                 if age_hours <= 3:
-                    recent_files.append(file_path)
-                    logging.info(f"   ✅ Added as recent file")
-                else:
-                    logging.info(f"   ⚠️ Too old ({age_hours:.1f}h)")
-            else:
-                logging.info(f"   ❌ Not a video file")
+                    recent_files.append((file_size, file_path))
             
-            if file_size < 1024 * 1024: 
-                logging.info(f"   ⚠️ File too small ({file_size} bytes)")
-            
-            logging.info(f"   ---")
+            if debug_enabled:
+                logging.debug("🔍 %s | %.1f MB | %.1f h | video=%s | recent=%s",
+                              file, file_size / (1024*1024), age_hours, is_video, is_video and age_hours <= 3)
         
-        logging.info(f"📊 Analysis results:")
-        logging.info(f"   - Total files: {len(all_files)}")
-        logging.info(f"   - Video candidates: {len(candidate_files)}")
-        logging.info(f"   - Recent files: {len(recent_files)}")
+        logging.info(f"📊 Analysis: {len(all_files)} files, {len(candidate_files)} video candidates, {len(recent_files)} recent")
         
         target_files = recent_files if recent_files else candidate_files
         
@@ -325,42 +579,20 @@ def find_downloaded_file(output_dir: str, custom_name: str) -> Optional[str]:
                 return None
             
             logging.warning(f"🔄 Desperate mode: trying any recent file > 10MB")
-            for file in all_files:
-                file_path = os.path.join(output_dir, file)
-                if os.path.isfile(file_path):
-                    size = os.path.getsize(file_path)
-                    age = (current_time - os.path.getmtime(file_path)) / 3600
-                    if size > 10 * 1024 * 1024 and age <= 2:
-                        logging.warning(f"🎯 Desperate pick: {file} ({size/(1024*1024):.1f} MB)")
-                        return file_path
+            for file, file_path, _, size, mtime in regular_files:
+                age = (current_time - mtime) / 3600
+                if size > 10 * 1024 * 1024 and age <= 2:
+                    logging.warning(f"🎯 Desperate pick: {file} ({size/(1024*1024):.1f} MB)")
+                    return file_path
             
             return None
         
-        largest_file = max(target_files, key=os.path.getsize)
-        largest_size = os.path.getsize(largest_file) / (1024*1024)
+        largest_bytes, largest_file = max(target_files)
+        largest_size = largest_bytes / (1024*1024)
         
         logging.info(f"✅ Selected largest file: {os.path.basename(largest_file)} ({largest_size:.1f} MB)")
         
-        if custom_name:
-            ext = os.path.splitext(largest_file)[1] or '.mkv'
-            new_name = custom_name + ext
-            new_path = os.path.join(output_dir, new_name)
-            
-            try:
-                if os.path.exists(new_path) and new_path != largest_file:
-                    os.remove(new_path)
-                    logging.info(f"🗑️ Removed existing: {new_name}")
-                
-                if largest_file != new_path:
-                    os.rename(largest_file, new_path)
-                    logging.info(f"📝 Renamed to: {new_name}")
-                
-                return new_path
-            except Exception as rename_error:
-                logging.warning(f"⚠️ Rename failed: {rename_error}")
-                return largest_file
-        
-        return largest_file
+        return rename_to_custom_name(largest_file, output_dir, custom_name)
         
     except Exception as e:
         logging.error(f"❌ File search critical error: {e}")
@@ -368,6 +600,37 @@ def find_downloaded_file(output_dir: str, custom_name: str) -> Optional[str]:
         logging.error(f"❌ Traceback: {traceback.format_exc()}")
         return None
 
+def rename_to_custom_name(file_path: str, output_dir: str, custom_name: str) -> str:
+    if not custom_name:
+        return file_path
+
+    ext = os.path.splitext(file_path)[1] or '.mkv'
+    new_name = custom_name + ext
+    new_path = os.path.join(output_dir, new_name)
+    
+    if file_path == new_path:
+        return new_path
+    
+    try:
+        # Atomically overwrites an existing file with the same name
+        os.replace(file_path, new_path)
+        logging.info(f"📝 Renamed to: {new_name}")
+        return new_path
+    except OSError as rename_error:
+        logging.warning(f"⚠️ Rename failed: {rename_error}")
+        return file_path
+
+def completed_file_from_status(status: dict) -> Optional[str]:
+    """Largest downloaded file reported by aria2 for a finished GID"""
+    files = [
+        f for f in status.get("files", [])
+        if f.get("path") and f.get("selected", "true") == "true" and not f["path"].startswith("[METADATA]")
+    ]
+    if not files:
+        return None
+    largest = max(files, key=lambda f: int(f.get("length", 0)))
+    return largest["path"] if os.path.isfile(largest["path"]) else None
+
 async def download_magnet_with_progress(magnet_link: str, 
                                       progress_callback: Optional[Callable] = None,
                                       custom_name: Optional[str] = None,
@@ -381,40 +644,40 @@ async def download_magnet_with_progress(magnet_link: str,
         interaction=interaction
     )
 
+async def download_magnets_batch(jobs: List[Tuple[str, str]],
+                                 output_dir: str = "downloads",
+                                 interaction: Optional[discord.Interaction] = None) -> List[Tuple[bool, str]]:
+    """Run several magnet downloads side by side on the shared aria2 daemon"""
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(download_magnet_fast(link, name, output_dir, interaction))
+                     for link, name in jobs]
+        return [task.result() for task in tasks]
+    
+    results = await asyncio.gather(
+        *(download_magnet_fast(link, name, output_dir, interaction) for link, name in jobs),
+        return_exceptions=True
+    )
+    return [(False, str(r)) if isinstance(r, BaseException) else r for r in results]
+
+def _fmt_elapsed(seconds: float) -> str:
+    elapsed = int(seconds)
+    return f"{elapsed//60}m {elapsed%60}s" if elapsed >= 60 else f"{elapsed}s"
+
 def get_active_downloads_info():
     try:
-        import asyncio
-        
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                return "Aktif download bilgisi alınamadı (async context)"
-            else:
-                downloads = loop.run_until_complete(_get_active_downloads_async())
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            downloads = loop.run_until_complete(_get_active_downloads_async())
-            loop.close()
-        
+        downloads = download_manager.active_downloads
         if not downloads:
             return "Aktif indirme yok"
         
-        info = []
-        for dl_id, data in downloads.items():
-            elapsed = int(time.time() - data['start_time'])
-            elapsed_str = f"{elapsed//60}m {elapsed%60}s" if elapsed >= 60 else f"{elapsed}s"
-            info.append(f"🔹 **ID:** `{dl_id}` | **Dosya:** `{data.get('name', 'Unknown')}` | **Süre:** `{elapsed_str}`")
-        
-        return "\n".join(info)
+        now = time.monotonic()
+        return "\n".join(
+            f"🔹 **ID:** `{dl_id}` | **Dosya:** `{data.get('name', 'Unknown')}` | **Süre:** `{_fmt_elapsed(now - data['start_monotonic'])}`"
+            for dl_id, data in downloads.items()
+        )
     except Exception as e:
         logging.error(f"❌ get_active_downloads_info error: {e}")
         return "Bilgi alınamadı"
 
-async def _get_active_downloads_async():
-    """Async helper function"""
-    async with download_manager.lock:
-        return download_manager.active_downloads.copy()
-
 def cancel_all_downloads(cancelled_by: str):
     return 0
\ No newline at end of file
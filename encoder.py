@@ -1,12 +1,15 @@
 import subprocess
 import os
 import asyncio
+import contextlib
 import logging
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import functools
+import itertools
 import json
 import re
+from collections import OrderedDict, deque
 from pathlib import Path
 
 try:
@@ -19,25 +22,95 @@ try:
 except ImportError:
     psutil = None
 
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[
+            logging.FileHandler('encoder.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
+DURATION_RE = re.compile(r'Duration: (\d{2}):(\d{2}):(\d{2})\.(\d{2})')
+
+# Tried in order; the first one that can actually encode a test frame wins
+HW_VIDEO_ENCODERS = [
+    ("h264_nvenc", ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"]),
+    ("h264_qsv", ["-preset", "veryfast", "-global_quality", "23"]),
+    ("h264_amf", ["-quality", "balanced", "-rc", "cqp", "-qp_i", "23", "-qp_p", "23"]),
+]
+
+# Probe results kept per (path, mtime, size); older entries are evicted first
+PROBE_CACHE_SIZE = 128
+
+@functools.lru_cache(maxsize=None)
+def find_ffmpeg():
+    paths = [
+        "ffmpeg",
+        "ffmpeg.exe", 
+        r"C:\ffmpeg\bin\ffmpeg.exe",
+        r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
+        r"D:\ffmpeg\bin\ffmpeg.exe"
+    ]
+    
+    for path in paths:
+        try:
+            result = subprocess.run(
+                [path, "-version"], 
+                capture_output=True, 
+                timeout=10,
+                text=True
+            )
+            if result.returncode == 0:
+                print(f"FFmpeg bulundu: {path}")
+                return path
+        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            continue
+            
+    raise FileNotFoundError("FFmpeg bulunamadı! Lütfen FFmpeg'i kurun ve PATH'e ekleyin.")
+
 class FastVideoEncoder:
+    NORMALIZE_FILTER = (
+        "fps=25,scale=1920:1080:force_original_aspect_ratio=decrease,"
+        "pad=1920:1080:(ow-iw)/2:(oh-ih)/2,setsar=1"
+    )
+    FILTER_TEMPLATE = (
+        "[0:v]{intro_filter}[intro_v];"
+        "[1:v]{episode_filter}[episode_v];"
+        "[0:a]aresample=48000[intro_a];"
+        "[1:a]aresample=48000[episode_a];"
+        "[intro_v][intro_a][episode_v][episode_a]concat=n=2:v=1:a=1[concat_v][concat_a];"
+        "[concat_v]ass='{subtitle}',setpts=PTS+{intro_duration}/TB[v]"
+    )
+    COPY_AUDIO_FILTER_TEMPLATE = "[0:v]setsar=1,ass='{subtitle}',setpts=PTS+{intro_duration}/TB[v]"
+
     def __init__(self):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            handlers=[
-                logging.FileHandler('encoder.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
         self.logger = logging.getLogger(__name__)
         
-        self.ffmpeg_path = self._find_ffmpeg()
+        self.ffmpeg_path = find_ffmpeg()
+        ffmpeg_dir, ffmpeg_name = os.path.split(self.ffmpeg_path)
+        self.ffprobe_path = os.path.join(ffmpeg_dir, "ffprobe" + os.path.splitext(ffmpeg_name)[1])
         self.output_dir = "encode"
         os.makedirs(self.output_dir, exist_ok=True)
         self.max_concurrent_encodes = 3
+        # Lowered while the CPU stays saturated, restored once it eases
+        self.encode_limit = self.max_concurrent_encodes
+        self.admission = None
+        self.queued_count = 0
+        self.load_monitor_task = None
+        # Split the cores between concurrent encodes instead of each ffmpeg grabbing all of them
+        self.threads_per_encode = max(1, (os.cpu_count() or 4) // self.max_concurrent_encodes)
         self.active_encodes = {}
+        self.format_cache = OrderedDict()
+        self.duration_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.hw_encoder = None
+        self.hw_encoder_checked = False
+        self.encode_seq = itertools.count(1)
+        self.stop_events = {}
+        # Only add/remove take the lock; reads and stop checks stay lock-free
         self.encode_lock = threading.Lock()
-        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent_encodes)
         
         self.logger.info("FastVideoEncoder başlatıldı")
 
@@ -46,7 +119,7 @@ class FastVideoEncoder:
         os.makedirs(log_dir, exist_ok=True)
         
         logger = logging.getLogger(f"encode_{encode_id}")
-        logger.setLevel(logging.DEBUG)
+        logger.setLevel(logging.DEBUG if os.environ.get("ENCODE_DEBUG") == "1" else logging.INFO)
         
         if logger.hasHandlers():
             logger.handlers.clear()
@@ -61,101 +134,153 @@ class FastVideoEncoder:
         
         return logger
 
-    def _find_ffmpeg(self):
-        paths = [
-            "ffmpeg",
-            "ffmpeg.exe", 
-            r"C:\ffmpeg\bin\ffmpeg.exe",
-            r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-            r"D:\ffmpeg\bin\ffmpeg.exe"
-        ]
-        
-        for path in paths:
-            try:
-                result = subprocess.run(
-                    [path, "-version"], 
-                    capture_output=True, 
-                    timeout=10,
-                    text=True
-                )
-                if result.returncode == 0:
-                    print(f"FFmpeg bulundu: {path}")
-                    return path
-            except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-                continue
-                
-        raise FileNotFoundError("FFmpeg bulunamadı! Lütfen FFmpeg'i kurun ve PATH'e ekleyin.")
-
     def find_video_file(self, filename):
         search_dirs = ["downloads", ".", "videos", "input", "temp"]
+        subdir, base_name = os.path.split(filename)
+        # normcase keeps the old case-insensitive os.path.exists behaviour on Windows
+        candidates = [os.path.normcase(base_name + ext) for ext in ('', '.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv')]
         
         for directory in search_dirs:
-            if os.path.exists(directory):
-                full_path = os.path.join(directory, filename)
-                if os.path.exists(full_path):
-                    return full_path
-                    
-                for ext in ['.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv']:
-                    full_path_with_ext = os.path.join(directory, filename + ext)
-                    if os.path.exists(full_path_with_ext):
-                        return full_path_with_ext
+            search_dir = os.path.join(directory, subdir)
+            try:
+                with os.scandir(search_dir) as entries:
+                    found = {
+                        os.path.normcase(entry.name): entry.path
+                        for entry in entries
+                        if os.path.normcase(entry.name) in candidates and entry.is_file()
+                    }
+            except OSError:
+                continue
+            
+            for candidate in candidates:
+                if candidate in found:
+                    return found[candidate]
         
         if os.path.exists(filename):
             return filename
             
         return None
 
+    @property
+    def active_count(self):
+        return len(self.active_encodes)
+
     def can_start_new_encode(self):
-        with self.encode_lock:
-            return len(self.active_encodes) < self.max_concurrent_encodes
+        return self.active_count < self.encode_limit
+
+    async def _acquire_slot(self, encode_id, user_info):
+        if self.admission is None:
+            self.admission = asyncio.Condition()
+        async with self.admission:
+            if not self.can_start_new_encode():
+                self.queued_count += 1
+                self.logger.info(f"⏳ Encode sırada: {encode_id} (aktif: {self.active_count}/{self.encode_limit})")
+                try:
+                    await self.admission.wait_for(self.can_start_new_encode)
+                finally:
+                    self.queued_count -= 1
+            self.add_active_encode(encode_id, user_info)
+        
+        if psutil and (self.load_monitor_task is None or self.load_monitor_task.done()):
+            self.load_monitor_task = asyncio.create_task(self._monitor_load())
+
+    async def _release_slot(self, encode_id):
+        self.remove_active_encode(encode_id)
+        async with self.admission:
+            self.admission.notify_all()
+
+    async def _monitor_load(self, interval=5, sustain=30, high=95, low=80):
+        busy_time = idle_time = 0
+        # Non-blocking sampling: each call reports usage since the previous one
+        psutil.cpu_percent(None)
+        while self.active_count or self.queued_count:
+            await asyncio.sleep(interval)
+            cpu = psutil.cpu_percent(None)
+            busy_time = busy_time + interval if cpu > high else 0
+            idle_time = idle_time + interval if cpu < low else 0
+            
+            if busy_time >= sustain and self.encode_limit > 1:
+                self.encode_limit -= 1
+                busy_time = 0
+                self.logger.warning(f"🔥 CPU %{cpu:.0f} - encode limiti {self.encode_limit} olarak düşürüldü")
+            elif idle_time >= sustain and self.encode_limit < self.max_concurrent_encodes:
+                self.encode_limit += 1
+                idle_time = 0
+                self.logger.info(f"🟢 CPU %{cpu:.0f} - encode limiti {self.encode_limit} olarak artırıldı")
+                async with self.admission:
+                    self.admission.notify_all()
+        
+        self.encode_limit = self.max_concurrent_encodes
 
     def get_active_encode_count(self):
-        with self.encode_lock:
-            return len(self.active_encodes)
+        return self.active_count
 
     def add_active_encode(self, encode_id, user_info):
         with self.encode_lock:
+            if encode_id in self.active_encodes:
+                raise ValueError(f"Encode ID zaten aktif: {encode_id}")
             self.active_encodes[encode_id] = {
                 'user': user_info,
                 'start_time': time.time(),
                 'status': 'running'
             }
+            self.stop_events[encode_id] = threading.Event()
 
     def remove_active_encode(self, encode_id):
         with self.encode_lock:
-            if encode_id in self.active_encodes:
-                del self.active_encodes[encode_id]
+            self.active_encodes.pop(encode_id, None)
+            self.stop_events.pop(encode_id, None)
 
     def get_active_encodes_info(self):
-        with self.encode_lock:
-            return self.active_encodes.copy()
+        return dict(self.active_encodes)
 
     def stop_encode(self, encode_id):
-        with self.encode_lock:
-            if encode_id in self.active_encodes:
-                if psutil:
-                    for proc in psutil.process_iter(['pid', 'cmdline']):
-                        try:
-                            if proc.info['cmdline'] and 'ffmpeg' in ' '.join(proc.info['cmdline']):
-                                if encode_id in ' '.join(proc.info['cmdline']):
-                                    proc.terminate()
-                                    time.sleep(2)
-                                    if proc.is_running():
-                                        proc.kill()
-                                    break
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            continue
-                
-                self.active_encodes[encode_id]['status'] = 'stopped'
-                return True
-        return False
+        stop_event = self.stop_events.get(encode_id)
+        if stop_event is None:
+            return False
+        
+        info = self.active_encodes.get(encode_id)
+        if info:
+            info['status'] = 'stopped'
+        stop_event.set()
+        
+        proc = info.get('proc') if info else None
+        if proc is not None and proc.returncode is None:
+            proc.terminate()
+        return True
+
+    def _cache_get(self, cache, key):
+        with self.cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache, key, value):
+        with self.cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > PROBE_CACHE_SIZE:
+                cache.popitem(last=False)
 
     def _get_video_duration(self, video_path):
         try:
-            ffprobe_path = self.ffmpeg_path.replace('ffmpeg', 'ffprobe')
-            
+            stat = os.stat(video_path)
+        except OSError:
+            return self._probe_video_duration(video_path)
+        
+        cache_key = (video_path, stat.st_mtime, stat.st_size)
+        duration = self._cache_get(self.duration_cache, cache_key)
+        if duration is None:
+            duration = self._probe_video_duration(video_path)
+            if duration is not None:
+                self._cache_put(self.duration_cache, cache_key, duration)
+        return duration
+
+    def _probe_video_duration(self, video_path):
+        try:
             cmd = [
-                ffprobe_path, "-v", "quiet",
+                self.ffprobe_path, "-v", "quiet",
                 "-show_entries", "format=duration",
                 "-of", "csv=p=0",
                 video_path
@@ -174,13 +299,102 @@ class FastVideoEncoder:
             self.logger.warning(f"FFprobe duration alma hatası: {e}")
             return self._get_duration_fallback(video_path)
 
+    def _detect_hw_encoder(self):
+        if self.hw_encoder_checked:
+            return self.hw_encoder
+        
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_path, "-hide_banner", "-encoders"],
+                capture_output=True, text=True, timeout=30
+            )
+            available = result.stdout
+            for name, options in HW_VIDEO_ENCODERS:
+                if name not in available:
+                    continue
+                # Listed encoders may still lack a usable device, so encode one test frame
+                test = subprocess.run(
+                    [self.ffmpeg_path, "-hide_banner", "-v", "error",
+                     "-f", "lavfi", "-i", "color=s=256x144:d=0.1",
+                     "-c:v", name, "-f", "null", "-"],
+                    capture_output=True, timeout=30
+                )
+                if test.returncode == 0:
+                    self.hw_encoder = (name, options)
+                    self.logger.info(f"⚡ Donanım encoder bulundu: {name}")
+                    break
+        except Exception as e:
+            self.logger.warning(f"Donanım encoder kontrol hatası: {e}")
+        
+        self.hw_encoder_checked = True
+        return self.hw_encoder
+
+    def _video_codec_args(self):
+        if self.hw_encoder:
+            name, options = self.hw_encoder
+            return ["-c:v", name, *options]
+        return [
+            "-c:v", "libx264",
+            "-threads", str(self.threads_per_encode),
+            "-preset", "veryfast",
+            "-crf", "23",
+        ]
+
+    def _probe_streams(self, video_path):
+        """(video, audio) stream parameters of the first video and audio stream, cached"""
+        try:
+            stat = os.stat(video_path)
+            cache_key = (video_path, stat.st_mtime, stat.st_size)
+            cached = self._cache_get(self.format_cache, cache_key)
+            if cached is not None:
+                return cached
+            
+            cmd = [
+                self.ffprobe_path, "-v", "quiet",
+                "-show_entries", "stream=codec_type,codec_name,profile,level,width,height,pix_fmt,r_frame_rate,time_base,sample_rate,channels",
+                "-of", "json",
+                video_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            if result.returncode != 0:
+                return None, None
+            
+            video = audio = None
+            for stream in json.loads(result.stdout).get("streams", []):
+                if stream.get("codec_type") == "video" and video is None:
+                    video = (stream.get("codec_name"), stream.get("width"), stream.get("height"), stream.get("r_frame_rate"),
+                             stream.get("pix_fmt"), stream.get("profile"), stream.get("level"), stream.get("time_base"))
+                elif stream.get("codec_type") == "audio" and audio is None:
+                    audio = (stream.get("codec_name"), stream.get("sample_rate"), stream.get("channels"),
+                             stream.get("profile"), stream.get("time_base"))
+            
+            self._cache_put(self.format_cache, cache_key, (video, audio))
+            return video, audio
+        except Exception as e:
+            self.logger.warning(f"FFprobe format kontrol hatası: {e}")
+            return None, None
+
+    @staticmethod
+    def _is_target_video(video):
+        """True when the video is already 1920x1080 at 25 fps and can skip fps/scale/pad"""
+        return video is not None and video[1:4] == (1920, 1080, "25/1")
+
+    def _write_concat_list(self, encode_id, paths):
+        list_path = os.path.join(self.output_dir, f"concat_{encode_id}.txt")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for path in paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        return list_path
+
     def _get_duration_fallback(self, video_path):
         try:
-            cmd = [self.ffmpeg_path, "-i", video_path, "-f", "null", "-"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            # Without an output ffmpeg only prints the input header (and exits non-zero), no decoding
+            cmd = [self.ffmpeg_path, "-hide_banner", "-i", video_path]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             stderr = result.stderr
             
-            duration_match = re.search(r'Duration: (\d{2}):(\d{2}):(\d{2})\.(\d{2})', stderr)
+            duration_match = DURATION_RE.search(stderr)
             if duration_match:
                 hours = int(duration_match.group(1))
                 minutes = int(duration_match.group(2))
@@ -240,28 +454,30 @@ class FastVideoEncoder:
 
     def _validate_subtitle_file(self, subtitle_path):
         try:
+            # ASS/SSA section headers sit at the top of the file; no need to read the fonts/events
             with open(subtitle_path, 'r', encoding='utf-8-sig') as f:
-                content = f.read().strip()
+                header = f.read(4096).strip()
             
-            if not content:
+            if not header:
                 raise ValueError("Altyazı dosyası boş")
             
-            if not ('[Script Info]' in content or '[V4 Styles]' in content or '[V4+ Styles]' in content):
+            if not ('[Script Info]' in header or '[V4 Styles]' in header or '[V4+ Styles]' in header):
                 raise ValueError("Geçersiz ASS/SSA format")
             
             subtitle_path_fixed = subtitle_path.replace('\\', '/').replace(':', '\\:')
             
-            self.logger.info(f"✅ Subtitle validated: {len(content)} chars")
+            self.logger.info(f"✅ Subtitle validated: {os.path.getsize(subtitle_path)} bytes")
             return subtitle_path_fixed, True
             
         except Exception as e:
             self.logger.error(f"❌ Subtitle validation error: {e}")
             return subtitle_path, False
 
-    def _run_simple_encoding(self, intro_path, episode_path, output_path, subtitle_path, encode_id, progress_callback=None):
+    async def _run_simple_encoding(self, intro_path, episode_path, output_path, subtitle_path, encode_id, progress_callback=None):
         logger = self._setup_logger(encode_id)
         start_time = time.time()
         logger.info(f"🎬 Encoding started for ID: {encode_id}")
+        concat_list = None
 
         try:
             files_to_check = [
@@ -279,8 +495,28 @@ class FastVideoEncoder:
                     size = os.path.getsize(path) / (1024*1024)
                     logger.info(f"✅ {name}: {path} ({size:.1f} MB)")
 
-            intro_duration = self._get_video_duration(intro_path) or 10.0
-            episode_duration = self._get_video_duration(episode_path) or 1400.0
+            # Each probe is its own ffprobe/ffmpeg spawn, so run them side by side
+            (hw_encoder,
+             (intro_video, intro_audio), (episode_video, episode_audio),
+             intro_duration, episode_duration) = await asyncio.gather(
+                asyncio.to_thread(self._detect_hw_encoder),
+                asyncio.to_thread(self._probe_streams, intro_path),
+                asyncio.to_thread(self._probe_streams, episode_path),
+                asyncio.to_thread(self._get_video_duration, intro_path),
+                asyncio.to_thread(self._get_video_duration, episode_path)
+            )
+            intro_duration = intro_duration or 10.0
+            episode_duration = episode_duration or 1400.0
+            intro_ready = self._is_target_video(intro_video)
+            episode_ready = self._is_target_video(episode_video)
+            # Identical 1080p25 video plus AAC 48 kHz stereo on both sides can go through the
+            # concat demuxer with the audio stream-copied instead of resampled and re-encoded.
+            # pix_fmt, profile, level and time base are part of the tuples, so any mismatch
+            # falls back to the filter graph instead of producing a broken concat
+            copy_audio = (
+                intro_ready and intro_video == episode_video
+                and intro_audio == episode_audio and intro_audio[:3] == ("aac", "48000", 2)
+            )
             total_duration = intro_duration + episode_duration
             
             logger.info(f"📊 Video durations - Intro: {intro_duration:.1f}s, Episode: {episode_duration:.1f}s, Total: {total_duration:.1f}s")
@@ -291,37 +527,46 @@ class FastVideoEncoder:
 
             logger.info("🔧 Single-pass encoding: Concat + Subtitle")
             
-            filter_complex = (
-                "[0:v]fps=25,scale=1920:1080:force_original_aspect_ratio=decrease,"
-                "pad=1920:1080:(ow-iw)/2:(oh-ih)/2,setsar=1[intro_v];"
-                "[1:v]fps=25,scale=1920:1080:force_original_aspect_ratio=decrease,"
-                "pad=1920:1080:(ow-iw)/2:(oh-ih)/2,setsar=1[episode_v];"
-                "[0:a]aresample=48000[intro_a];"
-                "[1:a]aresample=48000[episode_a];"
-                "[intro_v][intro_a][episode_v][episode_a]concat=n=2:v=1:a=1[concat_v][concat_a];"
-                f"[concat_v]ass='{subtitle_path_safe}',setpts=PTS+{intro_duration}/TB[v]"
-            )
+            logger.info(f"📐 1080p25 kaynak - Intro: {intro_ready}, Episode: {episode_ready}, ses kopyalama: {copy_audio}")
+            hwaccel = ["-hwaccel", "auto"] if hw_encoder else []
+            
+            if copy_audio:
+                concat_list = self._write_concat_list(encode_id, [intro_path, episode_path])
+                inputs = [*hwaccel, "-f", "concat", "-safe", "0", "-i", concat_list]
+                filter_complex = self.COPY_AUDIO_FILTER_TEMPLATE.format(
+                    subtitle=subtitle_path_safe,
+                    intro_duration=intro_duration
+                )
+                audio_args = ["-map", "0:a", "-c:a", "copy"]
+            else:
+                inputs = [*hwaccel, "-i", intro_path, *hwaccel, "-i", episode_path]
+                filter_complex = self.FILTER_TEMPLATE.format(
+                    intro_filter="setsar=1" if intro_ready else self.NORMALIZE_FILTER,
+                    episode_filter="setsar=1" if episode_ready else self.NORMALIZE_FILTER,
+                    subtitle=subtitle_path_safe,
+                    intro_duration=intro_duration
+                )
+                audio_args = ["-map", "[concat_a]", "-c:a", "aac", "-b:a", "128k"]
 
             command = [
                 self.ffmpeg_path, "-y",
-                "-i", intro_path,
-                "-i", episode_path,
+                "-filter_complex_threads", str(self.threads_per_encode),
+                *inputs,
                 "-filter_complex", filter_complex,
                 "-map", "[v]",
-                "-map", "[concat_a]",
-                "-c:v", "libx264",
-                "-preset", "veryfast",       
-                "-crf", "23",                
-                "-c:a", "aac",
-                "-b:a", "128k",
+                *audio_args,
+                *self._video_codec_args(),
                 "-r", "25",
                 "-movflags", "+faststart",
+                "-progress", "pipe:2",
+                "-nostats",
                 output_path
             ]
 
-            logger.info(f"🔧 FFmpeg command: {' '.join(command)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔧 FFmpeg command: %s", ' '.join(command))
 
-            result = self._run_ffmpeg_process(
+            result = await self._run_ffmpeg_process(
                 command, 
                 encode_id, 
                 logger, 
@@ -359,63 +604,80 @@ class FastVideoEncoder:
         except Exception as e:
             logger.exception(f"Exception during encoding: {str(e)}")
             return {'success': False, 'message': f'Hata: {str(e)}'}
+        finally:
+            if concat_list:
+                try:
+                    os.remove(concat_list)
+                except OSError:
+                    pass
 
-    def _run_ffmpeg_process(self, command, encode_id, logger, expected_duration, progress_callback=None, progress_offset=0):
+    async def _run_ffmpeg_process(self, command, encode_id, logger, expected_duration, progress_callback=None, progress_offset=0):
         try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
             )
 
-            stderr_output = ""
-            current_progress = progress_offset
+            info = self.active_encodes.get(encode_id)
+            if info is not None:
+                info['proc'] = process
 
-            while True:
-                stderr_line = process.stderr.readline()
-                
-                if stderr_line:
-                    stderr_output += stderr_line
-                    logger.debug(f"STDERR: {stderr_line.strip()}")
-                    
-                    if 'time=' in stderr_line and expected_duration > 0:
-                        try:
-                            time_match = re.search(r'time=(\d{2}):(\d{2}):(\d{2})\.(\d{2})', stderr_line)
-                            if time_match:
-                                hours = int(time_match.group(1))
-                                minutes = int(time_match.group(2))
-                                seconds = int(time_match.group(3))
-                                centiseconds = int(time_match.group(4))
-                                
-                                elapsed_time = hours * 3600 + minutes * 60 + seconds + centiseconds/100
-                                stage_progress = min((elapsed_time / expected_duration) * 100, 100)
-                                current_progress = int(stage_progress)
-                                current_progress = min(current_progress, 99)
-                                
-                                if progress_callback:
-                                    progress_callback(current_progress)
-                                    
-                        except:
-                            pass
+            stderr_tail = deque(maxlen=64)
+            current_progress = progress_offset
+            stop_event = self.stop_events.get(encode_id)
+            if stop_event is not None and stop_event.is_set():
+                process.terminate()
+            expected_us = expected_duration * 1_000_000
+
+            # Read in large chunks and split lines ourselves; one progress block is ~12 lines
+            pending = b""
+            while not (stop_event is not None and stop_event.is_set()):
+                chunk = await process.stderr.read(65536)
+                if not chunk:
+                    break
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
                 
-                if encode_id in self.active_encodes and self.active_encodes[encode_id].get('status') == 'stopped':
+                for stderr_line in lines:
+                    key, sep, value = stderr_line.partition(b"=")
+                    if sep and b" " not in key:
+                        # -progress emits key=value blocks; out_time_ms is in microseconds despite the name
+                        if key == b"out_time_ms" and expected_us > 0:
+                            try:
+                                stage_progress = min(int(value) / expected_us * 100, 100)
+                            except ValueError:
+                                continue
+                            current_progress = min(int(stage_progress), 99)
+                            
+                            if progress_callback:
+                                progress_callback(current_progress)
+                    elif stderr_line.strip():
+                        line_text = stderr_line.decode('utf-8', errors='replace')
+                        stderr_tail.append(line_text + "\n")
+                        logger.debug("STDERR: %s", line_text.rstrip())
+
+            if pending.strip():
+                stderr_tail.append(pending.decode('utf-8', errors='replace'))
+
+            if stop_event is not None and stop_event.is_set():
+                if process.returncode is None:
                     process.terminate()
-                    logger.info(f"Process stopped by admin: {encode_id}")
-                    return {'success': False, 'message': 'Encoding admin tarafından durduruldu'}
-                
-                if process.poll() is not None:
-                    break
-
-            process.wait(timeout=30)
-            return_code = process.returncode
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                logger.info(f"Process stopped by admin: {encode_id}")
+                return {'success': False, 'message': 'Encoding admin tarafından durduruldu'}
+
+            return_code = await asyncio.wait_for(process.wait(), timeout=30)
             
             logger.info(f"🔧 Process return code: {return_code}")
             
             if return_code != 0:
-                error_output = stderr_output[-1000:] if stderr_output else "Bilinmeyen hata"
+                error_output = "".join(stderr_tail)[-1000:] or "Bilinmeyen hata"
                 logger.error(f"FFmpeg failed with code {return_code}")
                 logger.error(f"STDERR: {error_output}")
                 
@@ -426,7 +688,7 @@ class FastVideoEncoder:
 
             return {'success': True}
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error("Process timeout")
             return {'success': False, 'message': 'Process timeout'}
         except Exception as e:
@@ -435,11 +697,7 @@ class FastVideoEncoder:
 
     async def encode_single_pass(self, intro_path, episode_path, subtitle_path,
                                  output_filename, interaction, user_info="Unknown"):
-        if not self.can_start_new_encode():
-            active_count = self.get_active_encode_count()
-            return False, f"❌ Maksimum encode limitine ulaşıldı! Aktif: {active_count}/{self.max_concurrent_encodes}"
-
-        encode_id = f"{int(time.time())}_{user_info.replace(' ', '_')[:8]}"
+        encode_id = f"{int(time.time())}_{user_info.replace(' ', '_')[:8]}_{next(self.encode_seq)}"
         final_output = os.path.join(self.output_dir, output_filename)
 
         files_to_check = [
@@ -452,78 +710,57 @@ class FastVideoEncoder:
             if not os.path.exists(path):
                 return False, f"{name} dosyası bulunamadı: {path}"
 
-        self.add_active_encode(encode_id, user_info)
-
-        progress_percent = 0
+        await self._acquire_slot(encode_id, user_info)
 
-        def progress_callback(percent):
-            nonlocal progress_percent
-            progress_percent = percent
-
-        progress_msg = None
-        if interaction and discord:
-            try:
-                active_count = self.get_active_encode_count()
-                embed = discord.Embed(
-                    title="🚀 Video Encoding Başlatıldı",
-                    description=(
-                        f"🎬 Video işleniyor...\n"
-                        f"📊 Aktif encode: {active_count}/{self.max_concurrent_encodes}\n"
-                        f"⏳ İlerleme: {progress_percent}%\n"
-                        f"🆔 ID: `{encode_id}`"
-                    ),
-                    color=0x3498DB
-                )
-                progress_msg = await interaction.followup.send(embed=embed)
-            except Exception as e:
-                self.logger.error(f"❌ Discord mesajı gönderilemedi: {e}")
-
-        self.logger.info(f"🎬 Starting encoding: {encode_id} - {output_filename}")
-
-        loop = asyncio.get_event_loop()
-        encoding_task = loop.run_in_executor(
-            self.executor,
-            self._run_simple_encoding,
-            intro_path,
-            episode_path,
-            final_output,
-            subtitle_path,
-            encode_id,
-            progress_callback
-        )
+        try:
+            progress_percent = 0
 
-        start_time = time.time()
-        last_update = 0
+            def progress_callback(percent):
+                nonlocal progress_percent
+                progress_percent = percent
 
-        while not encoding_task.done():
-            current_time = time.time()
-            
-            if current_time - last_update > 45 and progress_msg and discord:
+            progress_msg = None
+            if interaction and discord:
                 try:
-                    elapsed_minutes = int((current_time - start_time) / 60)
                     active_count = self.get_active_encode_count()
-
                     embed = discord.Embed(
-                        title="⚡ Video Encoding Devam Ediyor",
+                        title="🚀 Video Encoding Başlatıldı",
                         description=(
-                            f"🔥 İşleniyor...\n"
-                            f"⏱️ Süre: {elapsed_minutes} dakika\n"
-                            f"📊 Aktif: {active_count}/{self.max_concurrent_encodes}\n"
+                            f"🎬 Video işleniyor...\n"
+                            f"📊 Aktif encode: {active_count}/{self.max_concurrent_encodes}\n"
                             f"⏳ İlerleme: {progress_percent}%\n"
                             f"🆔 ID: `{encode_id}`"
                         ),
-                        color=0xF39C12
+                        color=0x3498DB
                     )
-                    await progress_msg.edit(embed=embed)
-                    last_update = current_time
-                except Exception:
-                    last_update = current_time
-                    
-            await asyncio.sleep(15)
+                    progress_msg = await interaction.followup.send(embed=embed)
+                except Exception as e:
+                    self.logger.error(f"❌ Discord mesajı gönderilemedi: {e}")
 
-        result = await encoding_task
-        
-        self.remove_active_encode(encode_id)
+            self.logger.info(f"🎬 Starting encoding: {encode_id} - {output_filename}")
+
+            progress_task = None
+            if progress_msg and discord:
+                progress_task = asyncio.create_task(
+                    self._periodic_embed_update(progress_msg, encode_id, lambda: progress_percent, 45)
+                )
+
+            try:
+                result = await self._run_simple_encoding(
+                    intro_path,
+                    episode_path,
+                    final_output,
+                    subtitle_path,
+                    encode_id,
+                    progress_callback
+                )
+            finally:
+                if progress_task:
+                    progress_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await progress_task
+        finally:
+            await self._release_slot(encode_id)
 
         if result['success']:
             if progress_msg and discord:
@@ -556,39 +793,48 @@ class FastVideoEncoder:
                     pass
             return False, result['message']
 
+    async def _periodic_embed_update(self, progress_msg, encode_id, get_progress, interval):
+        start_time = time.time()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                elapsed_minutes = int((time.time() - start_time) / 60)
+                active_count = self.get_active_encode_count()
+
+                embed = discord.Embed(
+                    title="⚡ Video Encoding Devam Ediyor",
+                    description=(
+                        f"🔥 İşleniyor...\n"
+                        f"⏱️ Süre: {elapsed_minutes} dakika\n"
+                        f"📊 Aktif: {active_count}/{self.max_concurrent_encodes}\n"
+                        f"⏳ İlerleme: {get_progress()}%\n"
+                        f"🆔 ID: `{encode_id}`"
+                    ),
+                    color=0xF39C12
+                )
+                await progress_msg.edit(embed=embed)
+            except Exception as e:
+                self.logger.debug(f"Encode progress edit error [{encode_id}]: {e}")
+
     def cleanup_all_processes(self):
         logging.info("🧹 Cleaning up all processes")
         
-        if psutil:
-            terminated_count = 0
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if proc.info['name'] and 'ffmpeg' in proc.info['name'].lower():
-                        proc.terminate()
-                        terminated_count += 1
-                    elif proc.info['cmdline'] and any('ffmpeg' in arg.lower() for arg in proc.info['cmdline']):
-                        proc.terminate()
-                        terminated_count += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            time.sleep(3)
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if proc.info['name'] and 'ffmpeg' in proc.info['name'].lower():
-                        if proc.is_running():
-                            proc.kill()
-                    elif proc.info['cmdline'] and any('ffmpeg' in arg.lower() for arg in proc.info['cmdline']):
-                        if proc.is_running():
-                            proc.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            logging.info(f"🧹 Terminated {terminated_count} FFmpeg processes")
-        
         with self.encode_lock:
+            stop_events = list(self.stop_events.values())
+            encodes = list(self.active_encodes.values())
             self.active_encodes.clear()
+            self.stop_events.clear()
+        
+        terminated_count = 0
+        for stop_event in stop_events:
+            stop_event.set()
+        for info in encodes:
+            proc = info.get('proc')
+            if proc is not None and proc.returncode is None:
+                proc.terminate()
+                terminated_count += 1
         
+        logging.info(f"🧹 Terminated {terminated_count} FFmpeg processes")
         logging.info("🧹 All encoding processes cleaned up")
 
 
@@ -620,7 +866,7 @@ async def encode_video(intro_path, episode_file, subtitle_path, output_file, int
 
 def check_ffmpeg_installed():
     try:
-        FastVideoEncoder()
+        find_ffmpeg()
         return True
     except FileNotFoundError:
         return False
@@ -2,18 +2,130 @@ import json
 import os
 import time
 import logging
-import discord
 import asyncio
-import random
-from datetime import datetime
-from threading import Lock
-from typing import Optional, Dict, Any
+import atexit
+import itertools
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from threading import RLock
+from typing import TYPE_CHECKING, Optional, Dict, Any
+
+if TYPE_CHECKING:
+    import discord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_pretty(data) -> bytes:
+    """Indented UTF-8 JSON, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
 class ProfessionalBotStats:
     
+    __slots__ = (
+        "stats_file", "lock", "dirty", "flush_interval", "flush_task", "pending_ops",
+        "stats_version", "embed_cache", "embed_cache_version", "embed_cache_time", "embed_cache_ttl",
+        "today_str", "today_rollover", "today_bucket", "day_keys",
+        "start_mono_ns", "uptime_text", "uptime_text_until_ns", "download_rate", "encode_rate",
+        "stats", "animated_emojis", "emoji_rotators", "professional_colors", "health_table", "loading_embed", "loaded",
+    )
+    
+    RATE_KEYS = frozenset(("download_success", "download_failed", "encode_success", "encode_failed"))
+    
+    # Static dashboard text; only the placeholders change between renders
+    SYSTEM_INFO_TEMPLATE = """
+        ```yaml
+        System Health: {health_status}
+        Uptime: {uptime}
+        Status: 🟢 OPERATIONAL
+        Version: v4.0 PROFESSIONAL
+        ```
+        
+        **📡 Network Stats**
+        ```fix
+        Servers: {connected_servers:,}
+        Users: {total_users:,}
+        Peak Concurrent Ops: {peak_concurrent_operations}
+        ```
+        """
+    ACTIVITY_INFO_TEMPLATE = """
+        **{activity_emoji} Live Operations**
+        ```diff
+        + Active Downloads: {active_downloads}
+        + Active Encodes: {active_encodes}
+        + Commands Processed: {commands_processed:,}
+        ```
+        
+        **📊 Session Overview**
+        ```ini
+        [Downloads] {total_downloads:,} total
+        [Encodes] {total_encodes:,} total
+        [Success Rate] {success_rate:.1f}%
+        ```
+        """
+    PERFORMANCE_INFO_TEMPLATE = """
+        **📥 Download Performance**
+        ```ansi
+        \u001b[1;32m✓ Success: {download_success:,}\u001b[0m
+        \u001b[1;31m✗ Failed: {download_failed:,}\u001b[0m
+        \u001b[1;36m📊 Rate: {download_rate:.1f}%\u001b[0m {download_perf_emoji}
+        ```
+        
+        **🎬 Encoding Performance**
+        ```ansi
+        \u001b[1;32m✓ Success: {encode_success:,}\u001b[0m
+        \u001b[1;31m✗ Failed: {encode_failed:,}\u001b[0m
+        \u001b[1;36m📊 Rate: {encode_rate:.1f}%\u001b[0m {encode_perf_emoji}
+        ```
+        """
+    DAILY_INFO_TEMPLATE = """
+        **📅 Today's Activity**
+        ```yaml
+        Commands: {today_commands:,}
+        Downloads: {today_downloads:,}
+        Encodes: {today_encodes:,}
+        ```
+        
+        **🎯 Quick Stats**
+        ```fix
+        Total Operations: {total_operations:,}
+        Last Update: Just now
+        Data Processed: {data_processed:.1f} MB
+        ```
+        """
+    
     def __init__(self):
         self.stats_file = "logs/bot_stats.json"
-        self.lock = Lock()
+        # Reentrant so readers that merge pending deltas can nest inside a held snapshot lock
+        self.lock = RLock()
+        # Mutations only mark the stats dirty; a periodic task writes them out
+        self.dirty = False
+        self.flush_interval = 5.0
+        self.flush_task = None
+        self.pending_ops = deque()
+        # Any mutation bumps stats_version; get_stats_embed reuses its last embed while the version matches
+        self.stats_version = 0
+        self.embed_cache = None
+        self.embed_cache_version = -1
+        self.embed_cache_time = 0.0
+        self.embed_cache_ttl = 1.0
+        self.today_str = ""
+        self.today_rollover = 0.0
+        self.today_bucket = None
+        # Date keys of daily_stats, oldest first; the oldest day is dropped once 30 are kept
+        self.day_keys = deque(maxlen=30)
+        # Uptime is measured on the monotonic clock so NTP adjustments can't skew it
+        self.start_mono_ns = None
+        self.uptime_text = ""
+        self.uptime_text_until_ns = 0
+        # Success ratios (0-1), refreshed whenever a success/failure counter is merged
+        self.download_rate = 1.0
+        self.encode_rate = 1.0
         
         self.stats = {
             "commands_processed": 0,
@@ -34,18 +146,20 @@ class ProfessionalBotStats:
             "total_data_processed_mb": 0,
             "average_encoding_time": 0,
             "system_health_score": 100,
-            "daily_stats": {},
+            "daily_stats": defaultdict(self._new_day_bucket),
             "weekly_stats": {},
             "monthly_stats": {}
         }
         
         self.animated_emojis = {
-            "loading": ["⏳", "⌛", "🔄", "⚡"],
-            "success": ["✅", "🎉", "🌟", "💫"],
-            "error": ["❌", "⚠️", "🚨", "💥"],
-            "processing": ["🔥", "⚡", "🚀", "💨"],
-            "stats": ["📊", "📈", "📉", "💹"]
+            "loading": ("⏳", "⌛", "🔄", "⚡"),
+            "success": ("✅", "🎉", "🌟", "💫"),
+            "error": ("❌", "⚠️", "🚨", "💥"),
+            "processing": ("🔥", "⚡", "🚀", "💨"),
+            "stats": ("📊", "📈", "📉", "💹")
         }
+        # Emojis are decorative, so rotating through them is as good as picking at random
+        self.emoji_rotators = {k: itertools.cycle(v) for k, v in self.animated_emojis.items()}
         
         self.professional_colors = {
             "primary": 0x2C3E50,
@@ -59,11 +173,40 @@ class ProfessionalBotStats:
             "cyan": 0x1ABC9C
         }
         
-        os.makedirs("logs", exist_ok=True)
-        self.load_stats()
-        self.update_daily_stats()
+        # (status label, embed color, thumbnail) for every health score 0-100
+        colors = self.professional_colors
+        health_buckets = (
+            (95, "🟢 **EXCELLENT**", colors["success"], "https://cdn.discordapp.com/emojis/852878543653650433.gif"),
+            (90, "🔵 **VERY GOOD**", colors["success"], "https://cdn.discordapp.com/emojis/852878543653650433.gif"),
+            (85, "🔵 **VERY GOOD**", colors["warning"], "https://cdn.discordapp.com/emojis/852878544165183530.gif"),
+            (70, "🟡 **GOOD**", colors["warning"], "https://cdn.discordapp.com/emojis/852878544165183530.gif"),
+            (50, "🟠 **FAIR**", colors["danger"], "https://cdn.discordapp.com/emojis/852878544194674699.gif"),
+            (0, "🔴 **CRITICAL**", colors["danger"], "https://cdn.discordapp.com/emojis/852878544194674699.gif"),
+        )
+        self.health_table = tuple(
+            next(bucket[1:] for bucket in health_buckets if score >= bucket[0])
+            for score in range(101)
+        )
+        
+        self.loading_embed = None
+        
+        # The stats file is read on first use rather than at construction
+        self.loaded = False
+        atexit.register(self.flush)
         logging.info("🎯 ProfessionalBotStats initialized successfully")
     
+    def _ensure_loaded(self):
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            os.makedirs("logs", exist_ok=True)
+            self.load_stats()
+            self.update_daily_stats()
+            self._refresh_rates()
+    
     def load_stats(self):
         try:
             if os.path.exists(self.stats_file):
@@ -72,65 +215,119 @@ class ProfessionalBotStats:
                     for key, value in loaded_stats.items():
                         if key in self.stats:
                             self.stats[key] = value
+                    self.stats["daily_stats"] = defaultdict(self._new_day_bucket, self.stats["daily_stats"])
+                    for day in sorted(self.stats["daily_stats"]):
+                        self._track_day(day)
                     logging.info("✅ Previous statistics loaded successfully")
         except Exception as e:
             logging.warning(f"⚠️ Could not load stats from file: {e}")
     
+    def _serialize_stats(self) -> bytes:
+        with self.lock:
+            self.merge_pending()
+            self.dirty = False
+            self.stats["last_updated"] = time.time()
+            return dumps_pretty(self.stats)
+    
+    @staticmethod
+    def _atomic_write(path: str, payload: bytes):
+        tmp_path = path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    
     def save_stats(self):
         try:
-            with self.lock:
-                self.stats["last_updated"] = time.time()
-                with open(self.stats_file, "w", encoding="utf-8") as f:
-                    json.dump(self.stats, f, indent=2, ensure_ascii=False)
+            self._atomic_write(self.stats_file, self._serialize_stats())
+        except Exception as e:
+            # Keep the changes queued so the next flush retries them
+            self.dirty = True
+            logging.warning(f"⚠️ Could not save stats to file: {e}")
+    
+    async def save_stats_async(self):
+        try:
+            payload = self._serialize_stats()
+            await asyncio.to_thread(self._atomic_write, self.stats_file, payload)
         except Exception as e:
+            # Keep the changes queued so the next flush retries them
+            self.dirty = True
             logging.warning(f"⚠️ Could not save stats to file: {e}")
     
+    def flush(self):
+        if self.dirty:
+            self.save_stats()
+    
+    def start_flush_loop(self):
+        if self.flush_task is not None and not self.flush_task.done():
+            return
+        try:
+            self.flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+        except RuntimeError:
+            logging.debug("Stats flush loop needs a running event loop; saving on exit only")
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.dirty:
+                await self.save_stats_async()
+    
+    def _today(self) -> str:
+        """Current date key, recomputed only when local midnight has passed"""
+        if time.time() >= self.today_rollover:
+            with self.lock:
+                now = datetime.now()
+                self.today_str = now.strftime("%Y-%m-%d")
+                next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+                self.today_rollover = next_midnight.timestamp()
+                self.update_daily_stats()
+        return self.today_str
+    
+    @staticmethod
+    def _new_day_bucket() -> Dict[str, int]:
+        return {
+            "commands": 0,
+            "downloads": 0,
+            "encodes": 0,
+            "data_processed": 0
+        }
+    
+    def _track_day(self, day: str):
+        if len(self.day_keys) == self.day_keys.maxlen:
+            self.stats["daily_stats"].pop(self.day_keys.popleft(), None)
+        self.day_keys.append(day)
+    
     def update_daily_stats(self):
-        today = datetime.now().strftime("%Y-%m-%d")
-        if today not in self.stats["daily_stats"]:
-            self.stats["daily_stats"][today] = {
-                "commands": 0,
-                "downloads": 0,
-                "encodes": 0,
-                "data_processed": 0
-            }
-        
-        if len(self.stats["daily_stats"]) > 30:
-            oldest_date = min(self.stats["daily_stats"].keys())
-            del self.stats["daily_stats"][oldest_date]
+        today = self._today()
+        if not self.day_keys or self.day_keys[-1] != today:
+            self._track_day(today)
+        self.today_bucket = self.stats["daily_stats"][today]
     
     def get_animated_emoji(self, category: str) -> str:
-        return random.choice(self.animated_emojis.get(category, ["📊"]))
+        rotator = self.emoji_rotators.get(category)
+        return next(rotator) if rotator is not None else "📊"
     
     def calculate_system_health(self) -> int:
+        self.merge_pending()
         health_score = 100
-        
-        total_downloads = self.stats["download_success"] + self.stats["download_failed"]
-        if total_downloads > 0:
-            download_rate = self.stats["download_success"] / total_downloads
-            health_score -= (1 - download_rate) * 30
-        
-        total_encodes = self.stats["encode_success"] + self.stats["encode_failed"]
-        if total_encodes > 0:
-            encode_rate = self.stats["encode_success"] / total_encodes
-            health_score -= (1 - encode_rate) * 25
+        health_score -= (1 - self.download_rate) * 30
+        health_score -= (1 - self.encode_rate) * 25
         
         if self.stats["active_downloads"] + self.stats["active_encodes"] > 10:
             health_score -= 15
         
         return max(0, min(100, int(health_score)))
     
+    def _health_bucket(self, score: int) -> tuple:
+        return self.health_table[max(0, min(100, int(score)))]
+    
     def get_health_status(self, score: int) -> str:
-        if score >= 95:
-            return f"🟢 **EXCELLENT** ({score}%)"
-        elif score >= 85:
-            return f"🔵 **VERY GOOD** ({score}%)"
-        elif score >= 70:
-            return f"🟡 **GOOD** ({score}%)"
-        elif score >= 50:
-            return f"🟠 **FAIR** ({score}%)"
-        else:
-            return f"🔴 **CRITICAL** ({score}%)"
+        return f"{self._health_bucket(score)[0]} ({score}%)"
     
     def get_trend_indicator(self, current: int, previous: int) -> str:
         if current > previous:
@@ -141,233 +338,262 @@ class ProfessionalBotStats:
             return "➡️ →"
     
     def set_start_time(self):
-        self.stats["start_time"] = time.time()
-        self.stats["session_start"] = datetime.now().isoformat()
-        self.save_stats()
+        self._ensure_loaded()
+        start_time = time.time()
+        self.stats["start_time"] = start_time
+        self.start_mono_ns = time.monotonic_ns()
+        self.uptime_text_until_ns = 0
+        self.stats["session_start"] = datetime.fromtimestamp(start_time).isoformat()
+        self.stats_version += 1
+        self.dirty = True
+        self.start_flush_loop()
         logging.info("🚀 Bot start time recorded")
     
     def update_server_stats(self, servers: int, users: int):
+        self._ensure_loaded()
         self.stats["connected_servers"] = servers
         self.stats["total_users"] = users
-        self.save_stats()
+        self.stats_version += 1
+        self.dirty = True
+    
+    def _record(self, key: str, delta: int = 1, daily_key: Optional[str] = None):
+        self._record_batch(((key, delta, daily_key),))
+    
+    def _record_batch(self, ops: tuple):
+        # deque.append is atomic, so counters can be bumped from any thread without the lock
+        self.pending_ops.append(ops)
+        self.stats_version += 1
+        self.dirty = True
+    
+    def merge_pending(self):
+        """Fold recorded counter deltas into self.stats before reading or saving it"""
+        self._ensure_loaded()
+        if not self.pending_ops:
+            return
+        
+        stats = self.stats
+        today_bucket = None
+        rates_changed = False
+        with self.lock:
+            while True:
+                try:
+                    ops = self.pending_ops.popleft()
+                except IndexError:
+                    break
+                
+                for key, delta, daily_key in ops:
+                    if key == "average_encoding_time":
+                        # Running mean over successful encodes; the success counter is merged first
+                        stats[key] += (delta - stats[key]) / max(1, stats["encode_success"])
+                        continue
+                    
+                    stats[key] = max(0, stats[key] + delta)
+                    if delta > 0 and key in ("active_downloads", "active_encodes"):
+                        total_active = stats["active_downloads"] + stats["active_encodes"]
+                        if total_active > stats["peak_concurrent_operations"]:
+                            stats["peak_concurrent_operations"] = total_active
+                    if daily_key:
+                        if today_bucket is None:
+                            self._today()
+                            today_bucket = self.today_bucket
+                        today_bucket[daily_key] += delta
+                    if key in self.RATE_KEYS:
+                        rates_changed = True
+            
+            if rates_changed:
+                self._refresh_rates()
+    
+    def _refresh_rates(self):
+        stats = self.stats
+        total_downloads = stats["download_success"] + stats["download_failed"]
+        self.download_rate = stats["download_success"] / total_downloads if total_downloads > 0 else 1.0
+        total_encodes = stats["encode_success"] + stats["encode_failed"]
+        self.encode_rate = stats["encode_success"] / total_encodes if total_encodes > 0 else 1.0
+    
+    def record_download_start(self):
+        self._record_batch((
+            ("total_downloads", 1, "downloads"),
+            ("active_downloads", 1, None),
+        ))
+    
+    def record_download_end(self, success: bool, size_mb: float = 0):
+        self._record_batch((
+            ("active_downloads", -1, None),
+            ("download_success" if success else "download_failed", 1, None),
+            ("total_data_processed_mb", size_mb, "data_processed"),
+        ))
+    
+    def record_encode_start(self):
+        self._record_batch((
+            ("total_encodes", 1, "encodes"),
+            ("active_encodes", 1, None),
+        ))
+    
+    def record_encode_end(self, success: bool, seconds: float = 0, size_mb: float = 0):
+        ops = [
+            ("active_encodes", -1, None),
+            ("encode_success" if success else "encode_failed", 1, None),
+            ("total_data_processed_mb", size_mb, "data_processed"),
+        ]
+        if success and seconds > 0:
+            ops.append(("average_encoding_time", seconds, None))
+        self._record_batch(tuple(ops))
     
     def increment_commands_processed(self):
-        self.stats["commands_processed"] += 1
-        today = datetime.now().strftime("%Y-%m-%d")
-        if today in self.stats["daily_stats"]:
-            self.stats["daily_stats"][today]["commands"] += 1
-        self.save_stats()
+        self._record("commands_processed", daily_key="commands")
     
     def increment_total_downloads(self):
-        self.stats["total_downloads"] += 1
-        today = datetime.now().strftime("%Y-%m-%d")
-        if today in self.stats["daily_stats"]:
-            self.stats["daily_stats"][today]["downloads"] += 1
-        self.save_stats()
+        self._record("total_downloads", daily_key="downloads")
     
     def increment_active_downloads(self):
-        self.stats["active_downloads"] += 1
-        total_active = self.stats["active_downloads"] + self.stats["active_encodes"]
-        if total_active > self.stats["peak_concurrent_operations"]:
-            self.stats["peak_concurrent_operations"] = total_active
-        self.save_stats()
+        self._record("active_downloads")
     
     def decrement_active_downloads(self):
-        self.stats["active_downloads"] = max(0, self.stats["active_downloads"] - 1)
-        self.save_stats()
+        self._record("active_downloads", -1)
     
     def increment_download_success(self):
-        self.stats["download_success"] += 1
-        self.save_stats()
+        self._record("download_success")
     
     def increment_download_failed(self):
-        self.stats["download_failed"] += 1
-        self.save_stats()
+        self._record("download_failed")
     
     def increment_total_encodes(self):
-        self.stats["total_encodes"] += 1
-        today = datetime.now().strftime("%Y-%m-%d")
-        if today in self.stats["daily_stats"]:
-            self.stats["daily_stats"][today]["encodes"] += 1
-        self.save_stats()
+        self._record("total_encodes", daily_key="encodes")
     
     def increment_active_encodes(self):
-        self.stats["active_encodes"] += 1
-        total_active = self.stats["active_downloads"] + self.stats["active_encodes"]
-        if total_active > self.stats["peak_concurrent_operations"]:
-            self.stats["peak_concurrent_operations"] = total_active
-        self.save_stats()
+        self._record("active_encodes")
     
     def decrement_active_encodes(self):
-        self.stats["active_encodes"] = max(0, self.stats["active_encodes"] - 1)
-        self.save_stats()
+        self._record("active_encodes", -1)
     
     def increment_encode_success(self):
-        self.stats["encode_success"] += 1
-        self.save_stats()
+        self._record("encode_success")
     
     def increment_encode_failed(self):
-        self.stats["encode_failed"] += 1
-        self.save_stats()
+        self._record("encode_failed")
     
     def get_uptime(self) -> str:
         if not self.stats["start_time"]:
             return "Unknown"
         
-        uptime = time.time() - self.stats["start_time"]
-        days = int(uptime // 86400)
-        hours = int((uptime % 86400) // 3600)
-        minutes = int((uptime % 3600) // 60)
+        now_ns = time.monotonic_ns()
+        if now_ns < self.uptime_text_until_ns:
+            return self.uptime_text
+        
+        if self.start_mono_ns is not None:
+            uptime = (now_ns - self.start_mono_ns) // 1_000_000_000
+        else:
+            uptime = int(time.time() - self.stats["start_time"])
+        minutes, _ = divmod(uptime, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
         
         if days > 0:
-            return f"{days}d {hours}h {minutes}m"
+            text = f"{days}d {hours}h {minutes}m"
         elif hours > 0:
-            return f"{hours}h {minutes}m"
+            text = f"{hours}h {minutes}m"
         else:
-            return f"{minutes}m"
+            text = f"{minutes}m"
+        
+        self.uptime_text = text
+        self.uptime_text_until_ns = now_ns + 1_000_000_000
+        return text
     
     def get_success_rates(self) -> tuple:
-        total_downloads = self.stats["download_success"] + self.stats["download_failed"]
-        download_rate = (self.stats["download_success"] / total_downloads * 100) if total_downloads > 0 else 100
-        
-        total_encodes = self.stats["encode_success"] + self.stats["encode_failed"]
-        encode_rate = (self.stats["encode_success"] / total_encodes * 100) if total_encodes > 0 else 100
+        self.merge_pending()
+        return self.download_rate * 100, self.encode_rate * 100
+    
+    def get_stats_embed(self) -> "discord.Embed":
+        now = time.monotonic()
+        if (self.embed_cache is not None
+                and self.embed_cache_version == self.stats_version
+                and now - self.embed_cache_time < self.embed_cache_ttl):
+            return self.embed_cache.copy()
         
-        return download_rate, encode_rate
+        version = self.stats_version
+        embed = self._build_stats_embed()
+        self.embed_cache = embed
+        self.embed_cache_version = version
+        self.embed_cache_time = now
+        return embed.copy()
     
-    def get_stats_embed(self) -> discord.Embed:
+    def _build_stats_embed(self) -> "discord.Embed":
+        import discord
+        
+        now = datetime.now()
+        self.merge_pending()
         download_rate, encode_rate = self.get_success_rates()
         health_score = self.calculate_system_health()
         
-        if health_score >= 90:
-            embed_color = self.professional_colors["success"]
-        elif health_score >= 70:
-            embed_color = self.professional_colors["warning"]
-        else:
-            embed_color = self.professional_colors["danger"]
+        health_label, embed_color, thumbnail_url = self._health_bucket(health_score)
         
         embed = discord.Embed(
             title=f"🎯 **LEONIS BOT** - Professional Dashboard",
             description=f"```ansi\n\u001b[1;36m█▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀█\n█           SYSTEM STATUS: ONLINE            █\n█▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄█\u001b[0m\n```",
             color=embed_color,
-            timestamp=datetime.now()
+            timestamp=now
         )
         
-        health_status = self.get_health_status(health_score)
-        system_info = f"""
-        ```yaml
-        System Health: {health_status}
-        Uptime: {self.get_uptime()}
-        Status: 🟢 OPERATIONAL
-        Version: v4.0 PROFESSIONAL
-        ```
-        
-        **📡 Network Stats**
-        ```fix
-        Servers: {self.stats['connected_servers']:,}
-        Users: {self.stats['total_users']:,}
-        Peak Concurrent Ops: {self.stats['peak_concurrent_operations']}
-        ```
-        """
-        embed.add_field(name="🖥️ **SYSTEM OVERVIEW**", value=system_info, inline=False)
-        
-        activity_emoji = self.get_animated_emoji("processing")
-        activity_info = f"""
-        **{activity_emoji} Live Operations**
-        ```diff
-        + Active Downloads: {self.stats['active_downloads']}
-        + Active Encodes: {self.stats['active_encodes']}
-        + Commands Processed: {self.stats['commands_processed']:,}
-        ```
-        
-        **📊 Session Overview**
-        ```ini
-        [Downloads] {self.stats['total_downloads']:,} total
-        [Encodes] {self.stats['total_encodes']:,} total
-        [Success Rate] {((self.stats['download_success'] + self.stats['encode_success']) / max(1, self.stats['total_downloads'] + self.stats['total_encodes']) * 100):.1f}%
-        ```
-        """
-        embed.add_field(name="⚡ **REAL-TIME ACTIVITY**", value=activity_info, inline=True)
-        
-        download_perf_emoji = "🟢" if download_rate >= 90 else "🟡" if download_rate >= 70 else "🔴"
-        encode_perf_emoji = "🟢" if encode_rate >= 90 else "🟡" if encode_rate >= 70 else "🔴"
-        
-        performance_info = f"""
-        **📥 Download Performance**
-        ```ansi
-        \u001b[1;32m✓ Success: {self.stats['download_success']:,}\u001b[0m
-        \u001b[1;31m✗ Failed: {self.stats['download_failed']:,}\u001b[0m
-        \u001b[1;36m📊 Rate: {download_rate:.1f}%\u001b[0m {download_perf_emoji}
-        ```
-        
-        **🎬 Encoding Performance**
-        ```ansi
-        \u001b[1;32m✓ Success: {self.stats['encode_success']:,}\u001b[0m
-        \u001b[1;31m✗ Failed: {self.stats['encode_failed']:,}\u001b[0m
-        \u001b[1;36m📊 Rate: {encode_rate:.1f}%\u001b[0m {encode_perf_emoji}
-        ```
-        """
-        embed.add_field(name="🏆 **PERFORMANCE ANALYTICS**", value=performance_info, inline=True)
-        
-        today = datetime.now().strftime("%Y-%m-%d")
-        today_stats = self.stats["daily_stats"].get(today, {})
-        
-        daily_info = f"""
-        **📅 Today's Activity**
-        ```yaml
-        Commands: {today_stats.get('commands', 0):,}
-        Downloads: {today_stats.get('downloads', 0):,}
-        Encodes: {today_stats.get('encodes', 0):,}
-        ```
+        self._today()
+        today_stats = self.today_bucket
+        values = dict(
+            self.stats,
+            health_status=f"{health_label} ({health_score}%)",
+            uptime=self.get_uptime(),
+            activity_emoji=self.get_animated_emoji("processing"),
+            success_rate=(self.stats['download_success'] + self.stats['encode_success']) / max(1, self.stats['total_downloads'] + self.stats['total_encodes']) * 100,
+            download_rate=download_rate,
+            encode_rate=encode_rate,
+            download_perf_emoji="🟢" if download_rate >= 90 else "🟡" if download_rate >= 70 else "🔴",
+            encode_perf_emoji="🟢" if encode_rate >= 90 else "🟡" if encode_rate >= 70 else "🔴",
+            today_commands=today_stats.get('commands', 0),
+            today_downloads=today_stats.get('downloads', 0),
+            today_encodes=today_stats.get('encodes', 0),
+            total_operations=self.stats['total_downloads'] + self.stats['total_encodes'],
+            data_processed=self.stats.get('total_data_processed_mb', 0),
+        )
         
-        **🎯 Quick Stats**
-        ```fix
-        Total Operations: {(self.stats['total_downloads'] + self.stats['total_encodes']):,}
-        Last Update: Just now
-        Data Processed: {self.stats.get('total_data_processed_mb', 0):.1f} MB
-        ```
-        """
-        embed.add_field(name="📈 **ANALYTICS DASHBOARD**", value=daily_info, inline=False)
+        embed.add_field(name="🖥️ **SYSTEM OVERVIEW**", value=self.SYSTEM_INFO_TEMPLATE.format_map(values), inline=False)
+        embed.add_field(name="⚡ **REAL-TIME ACTIVITY**", value=self.ACTIVITY_INFO_TEMPLATE.format_map(values), inline=True)
+        embed.add_field(name="🏆 **PERFORMANCE ANALYTICS**", value=self.PERFORMANCE_INFO_TEMPLATE.format_map(values), inline=True)
+        embed.add_field(name="📈 **ANALYTICS DASHBOARD**", value=self.DAILY_INFO_TEMPLATE.format_map(values), inline=False)
         
         footer_emoji = self.get_animated_emoji("stats")
         embed.set_footer(
-            text=f"{footer_emoji} Professional Bot System | Developed by LeonisDev0 | Last Update: {datetime.now().strftime('%H:%M:%S')}",
+            text=f"{footer_emoji} Professional Bot System | Developed by LeonisDev0 | Last Update: {now.strftime('%H:%M:%S')}",
             icon_url="https://cdn.discordapp.com/emojis/852878543997227038.png"
         )
         
-        if health_score >= 90:
-            embed.set_thumbnail(url="https://cdn.discordapp.com/emojis/852878543653650433.gif")
-        elif health_score >= 70:
-            embed.set_thumbnail(url="https://cdn.discordapp.com/emojis/852878544165183530.gif")
-        else:
-            embed.set_thumbnail(url="https://cdn.discordapp.com/emojis/852878544194674699.gif")
+        embed.set_thumbnail(url=thumbnail_url)
         
         return embed
     
-    async def send_animated_stats(self, interaction: discord.Interaction):
-        loading_emoji = self.get_animated_emoji("loading")
-        loading_embed = discord.Embed(
-            title=f"{loading_emoji} Loading Professional Dashboard...",
-            description="```ansi\n\u001b[1;33m████████████████████████████████████████\u001b[0m\n```",
-            color=self.professional_colors["info"]
-        )
-        
-        await interaction.response.send_message(embed=loading_embed)
-        await asyncio.sleep(1)
-        
+    async def send_animated_stats(self, interaction: "discord.Interaction"):
+        if self.loading_embed is None:
+            import discord
+            
+            self.loading_embed = discord.Embed(
+                title=f"{self.animated_emojis['loading'][0]} Loading Professional Dashboard...",
+                description="```ansi\n\u001b[1;33m████████████████████████████████████████\u001b[0m\n```",
+                color=self.professional_colors["info"]
+            )
+        await interaction.response.send_message(embed=self.loading_embed)
         return True
     
-    def export_stats_report(self) -> Optional[str]:
-        try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            report_filename = f"logs/professional_report_{timestamp}.json"
+    def _build_stats_report(self) -> tuple:
+        # Snapshot and serialize under the lock; the caller writes the bytes without it
+        with self.lock:
+            self.merge_pending()
+            snap = self.stats
+            now = datetime.now()
+            report_filename = f"logs/professional_report_{now.strftime('%Y%m%d_%H%M%S')}.json"
             
-            download_rate, encode_rate = self.get_success_rates()
+            download_rate, encode_rate = self.download_rate * 100, self.encode_rate * 100
             health_score = self.calculate_system_health()
             
             report_data = {
                 "report_info": {
-                    "generated_at": datetime.now().isoformat(),
+                    "generated_at": now.isoformat(),
                     "report_version": "4.0 Professional",
                     "report_type": "Comprehensive System Analysis"
                 },
@@ -381,15 +607,31 @@ class ProfessionalBotStats:
                 "performance_metrics": {
                     "download_success_rate": download_rate,
                     "encode_success_rate": encode_rate,
-                    "overall_efficiency": ((self.stats['download_success'] + self.stats['encode_success']) / max(1, self.stats['total_downloads'] + self.stats['total_encodes'])) * 100,
-                    "peak_concurrent_operations": self.stats['peak_concurrent_operations']
+                    "overall_efficiency": ((snap['download_success'] + snap['encode_success']) / max(1, snap['total_downloads'] + snap['total_encodes'])) * 100,
+                    "peak_concurrent_operations": snap['peak_concurrent_operations']
                 },
-                "detailed_statistics": self.stats.copy(),
-                "daily_breakdown": self.stats["daily_stats"]
+                # Serialized before the lock is released, so the live dict needs no copy
+                "detailed_statistics": snap,
+                "daily_breakdown": snap["daily_stats"]
             }
             
-            with open(report_filename, "w", encoding="utf-8") as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            return report_filename, dumps_pretty(report_data)
+    
+    def export_stats_report(self) -> Optional[str]:
+        try:
+            report_filename, payload = self._build_stats_report()
+            self._atomic_write(report_filename, payload)
+            
+            logging.info(f"📋 Professional report exported: {report_filename}")
+            return report_filename
+        except Exception as e:
+            logging.error(f"❌ Failed to export report: {e}")
+            return None
+    
+    async def export_stats_report_async(self) -> Optional[str]:
+        try:
+            report_filename, payload = self._build_stats_report()
+            await asyncio.to_thread(self._atomic_write, report_filename, payload)
             
             logging.info(f"📋 Professional report exported: {report_filename}")
             return report_filename
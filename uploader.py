@@ -2,12 +2,16 @@ import os
 import json
 import time
 import asyncio
+import contextlib
+import functools
 import logging
 import hashlib
+import mmap
 import threading
-import glob
 from typing import Tuple, Optional, Callable, Dict, Any
 from pathlib import Path
+from types import MappingProxyType
+from datetime import datetime, timezone
 
 try:
     from google.oauth2.credentials import Credentials
@@ -15,12 +19,63 @@ try:
     from google.auth.transport.requests import Request
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
-    from googleapiclient.http import MediaFileUpload
+    from googleapiclient.http import MediaIoBaseUpload
+    import google_auth_httplib2
+    import httplib2
     GOOGLE_DRIVE_AVAILABLE = True
 except ImportError:
     GOOGLE_DRIVE_AVAILABLE = False
     logging.warning("Google Drive API packages not installed. Run: pip install google-api-python-client google-auth-oauthlib google-auth-httplib2")
 
+DRIVE_CHUNK_ALIGN = 256 * 1024
+DRIVE_MIN_CHUNK_SIZE = 16 * 1024 * 1024
+DRIVE_MAX_CHUNK_SIZE = 128 * 1024 * 1024
+
+# Search order for find_video_file; lower rank wins
+VIDEO_EXTENSION_RANK = MappingProxyType({
+    ext: rank for rank, ext in enumerate(('mp4', 'mkv', 'avi', 'mov', 'wmv', 'flv', 'webm', 'm4v'))
+})
+
+# Seconds to wait before retry attempt N (upload attempts) and chunk retry N
+RETRY_BACKOFF = (1, 2, 4, 8, 16)
+CHUNK_RETRY_BACKOFF = (2, 4, 6, 8, 10)
+
+MIME_TYPES = MappingProxyType({
+    'mp4': 'video/mp4',
+    'mkv': 'video/x-matroska',
+    'avi': 'video/x-msvideo',
+    'mov': 'video/quicktime',
+    'wmv': 'video/x-ms-wmv',
+    'flv': 'video/x-flv',
+    'webm': 'video/webm',
+    'mp3': 'audio/mpeg',
+    'wav': 'audio/wav',
+    'flac': 'audio/flac',
+    'zip': 'application/zip',
+    'rar': 'application/x-rar-compressed',
+    '7z': 'application/x-7z-compressed'
+})
+
+
+if GOOGLE_DRIVE_AVAILABLE:
+    class MmapMediaUpload(MediaIoBaseUpload):
+        """Resumable upload body sliced straight out of a read-only mmap of the file"""
+
+        def __init__(self, file_path: str, mimetype: str, chunksize: int):
+            with open(file_path, "rb") as f:
+                # mmap holds its own handle, so the file object can be closed right away
+                self.file_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                self.file_map.madvise(mmap.MADV_SEQUENTIAL)
+            super().__init__(self.file_map, mimetype, chunksize=chunksize, resumable=True)
+
+        def has_stream(self) -> bool:
+            # With a stream next_chunk reads through seek/read and never calls getbytes
+            return False
+
+        def getbytes(self, begin: int, length: int) -> bytes:
+            return self.file_map[begin:begin + length]
+
 
 class UploadManager:
     """Thread-safe upload progress manager"""
@@ -30,19 +85,21 @@ class UploadManager:
         self.upload_lock = threading.Lock()
         self.max_file_size = 5 * 1024 * 1024 * 1024  
         self.scopes = ['https://www.googleapis.com/auth/drive.file']
+        # Bumped on every change so readers can reuse the last snapshot
+        self.version = 0
+        self.snapshot: Dict[str, Dict[str, Any]] = {}
+        self.snapshot_version = 0
 
         os.makedirs("uploads", exist_ok=True)
         os.makedirs("temp_uploads", exist_ok=True)
         logging.info("UploadManager initialized - Max file size: 5GB")
 
     def get_file_hash(self, file_path: str) -> str:
-        """Generate SHA256 hash for file identification"""
-        hash_sha256 = hashlib.sha256()
+        """Generate a file identifier from its stat fingerprint"""
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()[:16]
+            st = os.stat(file_path)
+            fingerprint = f"{st.st_size}:{st.st_mtime_ns}:{st.st_ino}".encode()
+            return hashlib.blake2b(fingerprint, digest_size=8).hexdigest()
         except Exception as e:
             logging.error(f"Hash calculation failed: {e}")
             return str(int(time.time()))
@@ -60,27 +117,36 @@ class UploadManager:
                 'speed': '0 MB/s',
                 'eta': 'Calculating...'
             }
+            self.version += 1
 
     def update_upload_progress(self, upload_id: str, progress: int, speed: str = None, eta: str = None):
         """Update upload progress information"""
-        with self.upload_lock:
-            if upload_id in self.active_uploads:
-                self.active_uploads[upload_id]['progress'] = progress
-                if speed:
-                    self.active_uploads[upload_id]['speed'] = speed
-                if eta:
-                    self.active_uploads[upload_id]['eta'] = eta
+        # Only existing keys of the entry are rewritten, which is safe without the lock;
+        # the lock is kept for adds/removes and for building snapshots
+        info = self.active_uploads.get(upload_id)
+        if info is None:
+            return
+        info['progress'] = progress
+        if speed:
+            info['speed'] = speed
+        if eta:
+            info['eta'] = eta
+        self.version += 1
 
     def remove_upload(self, upload_id: str):
         """Remove upload from tracking"""
         with self.upload_lock:
             if upload_id in self.active_uploads:
                 del self.active_uploads[upload_id]
+                self.version += 1
 
     def get_active_uploads(self) -> Dict[str, Dict[str, Any]]:
-        """Get copy of active uploads"""
+        """Get a read-only snapshot of active uploads, rebuilt only after changes"""
         with self.upload_lock:
-            return self.active_uploads.copy()
+            if self.snapshot_version != self.version:
+                self.snapshot = {upload_id: dict(info) for upload_id, info in self.active_uploads.items()}
+                self.snapshot_version = self.version
+            return self.snapshot
 
 
 class GoogleDriveUploader:
@@ -91,13 +157,17 @@ class GoogleDriveUploader:
         self.token_file = "token.json"
         self.scopes = ['https://www.googleapis.com/auth/drive.file']
         self.service = None
-        self._lock = threading.Lock()
+        # Created on first use so it binds to the running event loop
+        self.auth_lock: Optional[asyncio.Lock] = None
+        # Kept for the life of the process and refreshed ahead of expiry in the background
+        self.credentials = None
+        self.refresh_task: Optional[asyncio.Task] = None
         
     def authenticate(self) -> bool:
         """Authenticate with Google Drive API using modern OAuth2"""
-        creds = None
+        creds = self.credentials
         
-        if os.path.exists(self.token_file):
+        if creds is None and os.path.exists(self.token_file):
             try:
                 creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
                 logging.info("Existing token loaded successfully")
@@ -136,16 +206,13 @@ class GoogleDriveUploader:
                     logging.error(f"OAuth flow failed: {e}")
                     raise Exception(f"Google Drive authentication failed: {e}")
             
-            try:
-                with open(self.token_file, 'w') as token:
-                    token.write(creds.to_json())
-                logging.info("Token saved successfully")
-            except Exception as e:
-                logging.warning(f"Failed to save token: {e}")
+            self._save_token(creds)
         
+        self.credentials = creds
 
         try:
-            self.service = build('drive', 'v3', credentials=creds, cache_discovery=False)
+            # The discovery document bundled with the client library is used, so no HTTP fetch
+            self.service = build('drive', 'v3', credentials=creds, cache_discovery=False, static_discovery=True)
             
             about = self.service.about().get(fields="user").execute()
             user_email = about.get('user', {}).get('emailAddress', 'Unknown')
@@ -157,78 +224,120 @@ class GoogleDriveUploader:
             self.service = None
             return False
     
+    def _save_token(self, creds):
+        try:
+            with open(self.token_file, 'w') as token:
+                token.write(creds.to_json())
+            logging.info("Token saved successfully")
+        except Exception as e:
+            logging.warning(f"Failed to save token: {e}")
+    
+    def start_refresh_loop(self):
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def _refresh_loop(self):
+        """Refresh the access token 5 minutes before it expires so uploads never wait on it"""
+        while True:
+            creds = self.credentials
+            if creds is None or creds.expiry is None or not creds.refresh_token:
+                return
+            
+            # google-auth keeps expiry as a naive UTC datetime
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            await asyncio.sleep(max(0.0, (creds.expiry - now).total_seconds() - 300))
+            if creds is not self.credentials:
+                continue
+            
+            try:
+                await asyncio.to_thread(creds.refresh, Request())
+                await asyncio.to_thread(self._save_token, creds)
+                logging.info("Token refreshed in background")
+            except Exception as e:
+                logging.warning(f"Background token refresh failed: {e}")
+                await asyncio.sleep(60)
+    
     def calculate_optimal_chunk_size(self, file_size: int) -> int:
         """Calculate optimal chunk size based on file size"""
-        if file_size < 50 * 1024 * 1024:
-            return 1024 * 1024 
-        elif file_size < 500 * 1024 * 1024:
-            return 5 * 1024 * 1024 
-        elif file_size < 2 * 1024 * 1024 * 1024: 
-            return 10 * 1024 * 1024 
-        else:
-            return 25 * 1024 * 1024 
+        # Roughly 32 chunks per file, kept between 16 and 128 MiB and on the 256 KiB
+        # boundary the resumable protocol requires
+        chunk_size = (file_size // 32) & ~(DRIVE_CHUNK_ALIGN - 1)
+        return min(DRIVE_MAX_CHUNK_SIZE, max(DRIVE_MIN_CHUNK_SIZE, chunk_size))
     
     def get_mime_type(self, file_path: str) -> str:
         """Get MIME type based on file extension"""
-        ext = os.path.splitext(file_path)[1].lower()
-        mime_types = {
-            '.mp4': 'video/mp4',
-            '.mkv': 'video/x-matroska',
-            '.avi': 'video/x-msvideo',
-            '.mov': 'video/quicktime',
-            '.wmv': 'video/x-ms-wmv',
-            '.flv': 'video/x-flv',
-            '.webm': 'video/webm',
-            '.mp3': 'audio/mpeg',
-            '.wav': 'audio/wav',
-            '.flac': 'audio/flac',
-            '.zip': 'application/zip',
-            '.rar': 'application/x-rar-compressed',
-            '.7z': 'application/x-7z-compressed'
-        }
-        return mime_types.get(ext, 'application/octet-stream')
+        return MIME_TYPES.get(file_path.rpartition('.')[2].lower(), 'application/octet-stream')
+    
+    def _authorized_http(self):
+        """Private Http for one upload; httplib2 connections must not be shared across threads"""
+        if self.credentials is None:
+            return None
+        return google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+    
+    @staticmethod
+    def _close_upload(http, media, chunk_future=None):
+        if chunk_future is not None and not chunk_future.cancelled():
+            # Retrieved so an abandoned chunk's error is not reported as never retrieved
+            chunk_future.exception()
+        if http is not None:
+            http.http.close()
+        # An open mapping keeps the file locked on Windows, so unmap instead of waiting for GC
+        if media is not None:
+            media.file_map.close()
+    
+    @staticmethod
+    async def _notify_progress(progress_callback: Callable, progress: int, speed_text: str, eta_text: str):
+        try:
+            await progress_callback(progress, speed_text, eta_text)
+        except Exception as cb_error:
+            logging.warning(f"Progress callback error: {cb_error}")
     
     async def upload_with_progress(self, file_path: str, progress_callback: Optional[Callable] = None, 
                                  max_retries: int = 3) -> Tuple[bool, Any]:
         """Upload file to Google Drive with progress tracking"""
         
-        if not os.path.exists(file_path):
+        try:
+            file_size = (await asyncio.to_thread(os.stat, file_path)).st_size
+        except FileNotFoundError:
             return False, f"File not found: {file_path}"
         
-        file_size = os.path.getsize(file_path)
         if file_size == 0:
             return False, "File is empty (0 bytes)"
         
         filename = os.path.basename(file_path)
         logging.info(f"Starting Google Drive upload: {filename} ({file_size / (1024*1024):.1f} MB)")
         
+        file_metadata = {
+            'name': filename,
+            'description': f'Uploaded by Professional Upload System at {time.strftime("%Y-%m-%d %H:%M:%S")}',
+            'parents': []
+        }
+        
+        chunk_size = self.calculate_optimal_chunk_size(file_size)
+        mime_type = self.get_mime_type(file_path)
+        
+        logging.info(f"Upload config - Chunk size: {chunk_size / (1024*1024):.1f} MB, MIME: {mime_type}")
+        
         for attempt in range(max_retries):
+            backoff = RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF) - 1)]
+            http = None
+            media = None
+            callback_task = None
+            chunk_future = None
             try:
-                with self._lock:
-                    if not self.service:
-                        if not self.authenticate():
-                            if attempt == max_retries - 1:
-                                return False, "Authentication failed after all retries"
-                            await asyncio.sleep(2 ** attempt)
-                            continue
-                
-                file_metadata = {
-                    'name': filename,
-                    'description': f'Uploaded by Professional Upload System at {time.strftime("%Y-%m-%d %H:%M:%S")}',
-                    'parents': []
-                }
+                if self.auth_lock is None:
+                    self.auth_lock = asyncio.Lock()
+                async with self.auth_lock:
+                    authenticated = self.service is not None or await asyncio.to_thread(self.authenticate)
+                if not authenticated:
+                    if attempt == max_retries - 1:
+                        return False, "Authentication failed after all retries"
+                    await asyncio.sleep(backoff)
+                    continue
+                self.start_refresh_loop()
+                http = self._authorized_http()
                 
-                chunk_size = self.calculate_optimal_chunk_size(file_size)
-                mime_type = self.get_mime_type(file_path)
-                
-                logging.info(f"Upload config - Chunk size: {chunk_size / (1024*1024):.1f} MB, MIME: {mime_type}")
-                
-                media = MediaFileUpload(
-                    file_path,
-                    mimetype=mime_type,
-                    resumable=True,
-                    chunksize=chunk_size
-                )
+                media = MmapMediaUpload(file_path, mime_type, chunk_size)
                 
                 request = self.service.files().create(
                     body=file_metadata,
@@ -238,49 +347,62 @@ class GoogleDriveUploader:
 
                 response = None
                 last_progress = 0
-                start_time = time.time()
+                last_logged_progress = 0
+                start_time = time.monotonic()
+                last_bytes = 0
+                last_time = start_time
+                ewma_bps = 0.0
                 stall_count = 0
                 retry_chunk_count = 0
                 
                 while response is None:
                     try:
-                        status, response = request.next_chunk()
+                        # Google's resumable protocol takes chunks strictly in order, so the overlap
+                        # comes from running the blocking upload in a thread while the progress
+                        # callback of the previous chunk runs on the event loop
+                        chunk_future = asyncio.ensure_future(asyncio.to_thread(request.next_chunk, http=http))
+                        # Shielded: cancelling the upload cannot stop the worker thread mid-chunk
+                        status, response = await asyncio.shield(chunk_future)
                         retry_chunk_count = 0
                         
                         if status:
-                            progress = int(status.progress() * 100)
-                            current_time = time.time()
-                            elapsed_time = current_time - start_time
+                            bytes_uploaded = status.resumable_progress
+                            progress = bytes_uploaded * 100 // file_size
+                            current_time = time.monotonic()
+                            delta_time = current_time - last_time
                             
-                            if progress > last_progress and elapsed_time > 0:
-                                bytes_uploaded = int(file_size * status.progress())
-                                speed_bytes_per_sec = bytes_uploaded / elapsed_time
-                                speed_mb_per_sec = speed_bytes_per_sec / (1024 * 1024)
+                            if progress > last_progress and delta_time > 0:
+                                # Smoothed per-chunk rate instead of the whole-upload average
+                                chunk_bps = (bytes_uploaded - last_bytes) / delta_time
+                                ewma_bps = chunk_bps if ewma_bps == 0 else 0.7 * ewma_bps + 0.3 * chunk_bps
+                                last_bytes = bytes_uploaded
+                                last_time = current_time
                                 
                                 remaining_bytes = file_size - bytes_uploaded
-                                eta_seconds = remaining_bytes / speed_bytes_per_sec if speed_bytes_per_sec > 0 else 0
+                                eta_seconds = remaining_bytes / ewma_bps if ewma_bps > 0 else 0
                                 
-                                speed_text = f"{speed_mb_per_sec:.1f} MB/s"
+                                speed_text = f"{ewma_bps / (1024 * 1024):.1f} MB/s"
                                 if eta_seconds > 60:
                                     eta_text = f"{eta_seconds/60:.1f} min"
                                 else:
                                     eta_text = f"{eta_seconds:.0f}s"
                                 
                                 if progress_callback:
-                                    try:
-                                        await progress_callback(progress, speed_text, eta_text)
-                                    except Exception as cb_error:
-                                        logging.warning(f"Progress callback error: {cb_error}")
+                                    if callback_task is not None:
+                                        await callback_task
+                                    callback_task = asyncio.create_task(
+                                        self._notify_progress(progress_callback, progress, speed_text, eta_text)
+                                    )
                                 
-                                logging.info(f"Upload progress: {progress}% - Speed: {speed_text} - ETA: {eta_text}")
+                                if progress >= last_logged_progress + 5:
+                                    logging.info("Upload progress: %d%% - Speed: %s - ETA: %s", progress, speed_text, eta_text)
+                                    last_logged_progress = progress
                                 last_progress = progress
                                 stall_count = 0
                             elif progress == last_progress:
                                 stall_count += 1
                                 if stall_count > 50:
                                     raise Exception("Upload progress stalled for too long")
-                            
-                            await asyncio.sleep(0.1)
                     
                     except HttpError as chunk_error:
                         retry_chunk_count += 1
@@ -289,7 +411,7 @@ class GoogleDriveUploader:
                         if chunk_error.resp.status in [500, 502, 503, 504]:
                             if retry_chunk_count >= 5:
                                 raise chunk_error
-                            await asyncio.sleep(min(retry_chunk_count * 2, 10))
+                            await asyncio.sleep(CHUNK_RETRY_BACKOFF[min(retry_chunk_count, len(CHUNK_RETRY_BACKOFF)) - 1])
                             continue
                         else:
                             raise chunk_error
@@ -300,9 +422,12 @@ class GoogleDriveUploader:
                         
                         if retry_chunk_count >= 3:
                             raise chunk_error
-                        await asyncio.sleep(retry_chunk_count * 2)
+                        await asyncio.sleep(CHUNK_RETRY_BACKOFF[min(retry_chunk_count, len(CHUNK_RETRY_BACKOFF)) - 1])
                         continue
                 
+                if callback_task is not None:
+                    await callback_task
+                
                 if not response or not response.get('id'):
                     raise Exception("Upload completed but no valid response received")
                 
@@ -317,11 +442,13 @@ class GoogleDriveUploader:
                         'role': 'reader'
                     }
                     
-                    self.service.permissions().create(
+                    permission_request = self.service.permissions().create(
                         fileId=file_id,
                         body=permission_body,
-                        supportsAllDrives=True
-                    ).execute()
+                        supportsAllDrives=True,
+                        fields='id'
+                    )
+                    await asyncio.to_thread(permission_request.execute, http=http)
                     
                     logging.info("File permissions set to public")
                 except Exception as perm_error:
@@ -330,7 +457,7 @@ class GoogleDriveUploader:
                 view_link = f"https://drive.google.com/file/d/{file_id}/view"
                 download_link = f"https://drive.google.com/uc?id={file_id}&export=download"
                 
-                upload_time = time.time() - start_time
+                upload_time = time.monotonic() - start_time
                 average_speed = (file_size / (1024 * 1024)) / upload_time if upload_time > 0 else 0
                 
                 logging.info(f"Upload completed successfully - Time: {upload_time/60:.1f}min, Avg Speed: {average_speed:.1f} MB/s")
@@ -359,15 +486,15 @@ class GoogleDriveUploader:
                     return False, "Google Drive API endpoint not found"
                 elif e.resp.status == 401:
                     logging.info("Authentication expired, retrying...")
-                    with self._lock:
-                        self.service = None
+                    self.service = None
+                    self.credentials = None
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(2 ** attempt)
+                        await asyncio.sleep(backoff)
                         continue
                     return False, "Authentication failed"
                 elif e.resp.status >= 500:
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(2 ** attempt)
+                        await asyncio.sleep(backoff)
                         continue
                     return False, f"Google Drive server error: {e.resp.status}"
                 else:
@@ -379,12 +506,24 @@ class GoogleDriveUploader:
                 
                 if any(err in str(e).lower() for err in ['network', 'connection', 'timeout', 'ssl', 'socket']):
                     if attempt < max_retries - 1:
-                        logging.info(f"Network error, retrying in {2 ** attempt} seconds...")
-                        await asyncio.sleep(2 ** attempt)
+                        logging.info(f"Network error, retrying in {backoff} seconds...")
+                        await asyncio.sleep(backoff)
                         continue
                 
                 if attempt == max_retries - 1:
                     return False, f"Upload failed after {max_retries} attempts: {str(e)}"
+            
+            finally:
+                # A progress edit from a failed attempt must not land after the retry's updates
+                if callback_task is not None and not callback_task.done():
+                    callback_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await callback_task
+                # The map and connection stay open until a still-running chunk thread is done with them
+                if chunk_future is not None and not chunk_future.done():
+                    chunk_future.add_done_callback(functools.partial(self._close_upload, http, media))
+                else:
+                    self._close_upload(http, media)
         
         return False, "Upload failed for unknown reason"
 
@@ -396,36 +535,49 @@ class VideoUploadBot:
         self.manager = UploadManager()
         self.gdrive = GoogleDriveUploader()
         self.encode_folder = "encode"
+        self.info_cache_key = None
+        self.info_cache_text = ""
     
     def find_video_file(self, video_name: str) -> Optional[str]:
         """Find video file in encode folder"""
-        if not os.path.exists(self.encode_folder):
+        # A single pass picks the exact name with the best-ranked extension, otherwise the
+        # best-ranked extension among substring matches and the smallest file within it;
+        # normcase keeps glob's case-insensitive matching on Windows
+        name_key = os.path.normcase(video_name)
+        exact = None
+        fuzzy = None
+        try:
+            with os.scandir(self.encode_folder) as entries:
+                for entry in entries:
+                    stem, _, ext = os.path.normcase(entry.name).rpartition('.')
+                    rank = VIDEO_EXTENSION_RANK.get(ext)
+                    if rank is None or name_key not in stem or not entry.is_file():
+                        continue
+                    if stem == name_key:
+                        if exact is None or rank < exact[0]:
+                            exact = (rank, entry)
+                    elif exact is None:
+                        candidate = (rank, entry.stat().st_size, entry)
+                        if fuzzy is None or candidate[:2] < fuzzy[:2]:
+                            fuzzy = candidate
+        except OSError:
             return None
-            
-        video_extensions = ['mp4', 'mkv', 'avi', 'mov', 'wmv', 'flv', 'webm', 'm4v']
-        
-        for ext in video_extensions:
-            exact_path = os.path.join(self.encode_folder, f"{video_name}.{ext}")
-            if os.path.exists(exact_path):
-                return exact_path
-
-        for ext in video_extensions:
-            pattern = os.path.join(self.encode_folder, f"*{video_name}*.{ext}")
-            files = glob.glob(pattern)
-            if files:
-                return min(files, key=os.path.getsize)
         
+        if exact is not None:
+            return exact[1].path
+        if fuzzy is not None:
+            return fuzzy[2].path
         return None
     
     async def upload_video(self, video_name: str, user_info: str = "Unknown", 
                           progress_callback: Optional[Callable] = None) -> Tuple[bool, Any]:
         """Upload video to Google Drive with progress tracking"""
         
-        file_path = self.find_video_file(video_name)
+        file_path = await asyncio.to_thread(self.find_video_file, video_name)
         if not file_path:
             return False, f"Video dosyası bulunamadı: {video_name}"
         
-        file_size = os.path.getsize(file_path)
+        file_size = await asyncio.to_thread(os.path.getsize, file_path)
         if file_size > self.manager.max_file_size:
             size_gb = file_size / (1024 * 1024 * 1024)
             return False, f"Dosya çok büyük: {size_gb:.2f}GB (max 5GB)"
@@ -433,7 +585,8 @@ class VideoUploadBot:
         if file_size == 0:
             return False, "Dosya boş"
         
-        upload_id = f"{int(time.time())}_{self.manager.get_file_hash(file_path)}"
+        file_hash = await asyncio.to_thread(self.manager.get_file_hash, file_path)
+        upload_id = f"{int(time.time())}_{file_hash}"
         self.manager.add_upload(upload_id, file_path, "gdrive", user_info)
         
         logging.info(f"Upload started [{upload_id}]: {os.path.basename(file_path)} ({file_size / (1024*1024):.1f} MB)")
@@ -470,13 +623,19 @@ class VideoUploadBot:
     
     def get_active_uploads_info(self) -> str:
         """Get formatted information about active uploads"""
+        # Elapsed times have one-second resolution, so the text only changes with the version or the second
+        now = time.time()
+        cache_key = (self.manager.version, int(now))
+        if cache_key == self.info_cache_key:
+            return self.info_cache_text
+        
         active = self.manager.get_active_uploads()
         if not active:
             return "Aktif upload yok"
         
         info_lines = []
         for upload_id, info in active.items():
-            elapsed = int(time.time() - info['start_time'])
+            elapsed = int(now - info['start_time'])
             elapsed_str = f"{elapsed//60}m {elapsed%60}s" if elapsed >= 60 else f"{elapsed}s"
             
             info_lines.append(
@@ -489,7 +648,9 @@ class VideoUploadBot:
                 f"   🕐 **Elapsed:** {elapsed_str}\n"
             )
         
-        return "\n".join(info_lines)
+        self.info_cache_text = "\n".join(info_lines)
+        self.info_cache_key = cache_key
+        return self.info_cache_text
 
 
 